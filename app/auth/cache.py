@@ -0,0 +1,216 @@
+# backend/app/auth/cache.py
+
+"""
+Per-process TTL LRU of authenticated users and their plans.
+
+get_current_user + get_user_plan used to cost two queries per API call; now one
+joined User+Plan query fills a frozen snapshot that is reused for
+AUTH_CACHE_TTL seconds. Snapshots are plain dataclasses (no session, no
+password hash), so they are safe to share between requests and threads.
+
+Verified bearer tokens are cached too (keyed by SHA-256 digest, never the raw
+token) until their own exp, so a polling client skips the HMAC check + JSON
+parse on every request.
+
+invalidate_user()/invalidate_plan() drop entries in this process;
+invalidate_user() also drops that user's tokens, so a deleted user is
+rejected on the next request. Changes made elsewhere (another API node, or
+scripts/make_paid.py) go through notify_user_changed()/notify_plan_changed():
+on Postgres a NOTIFY auth_invalidate sent with the change's commit reaches
+every process's LISTEN thread. SQLite has no cross-process channel, so there
+other processes pick the change up when AUTH_CACHE_TTL expires.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.core.config import AUTH_CACHE_TTL, AUTH_CACHE_SIZE, TOKEN_CACHE_SIZE
+from app.core.security import decode_claims
+from app.db.notify import PgListener, notify
+from app.users.models import User
+from app.plans.models import Plan
+
+
+@dataclass(frozen=True)
+class PlanSnapshot:
+    id: int
+    name: str
+    max_sites: int | None
+    crawl_limit: int | None
+    max_duration_min: int | None
+    allow_deep_scan: bool | None
+    allow_scheduling: bool | None
+    allow_history: bool | None
+    priority_queue: bool | None
+
+    @classmethod
+    def from_row(cls, plan: Plan) -> "PlanSnapshot":
+        return cls(
+            id=plan.id,
+            name=plan.name,
+            max_sites=plan.max_sites,
+            crawl_limit=plan.crawl_limit,
+            max_duration_min=plan.max_duration_min,
+            allow_deep_scan=plan.allow_deep_scan,
+            allow_scheduling=plan.allow_scheduling,
+            allow_history=plan.allow_history,
+            priority_queue=plan.priority_queue,
+        )
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: int
+    email: str | None
+    is_admin: bool
+    plan_id: int | None
+    plan: PlanSnapshot | None
+
+
+# user_id -> (expires_at, snapshot); LRU order
+_cache: "OrderedDict[int, tuple[float, UserSnapshot]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+# sha256(token) -> (exp as unix time, user_id); LRU order
+_tokens: "OrderedDict[bytes, tuple[float, int]]" = OrderedDict()
+
+
+def decode_token_cached(token: str) -> int:
+    """
+    decode_token() with memo: a token verified once is trusted until its exp.
+    Invalid/expired tokens are never cached (decode_claims raises every time).
+    """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    now = time.time()
+    with _lock:
+        entry = _tokens.get(digest)
+        if entry:
+            if entry[0] > now:
+                _tokens.move_to_end(digest)
+                return entry[1]
+            _tokens.pop(digest, None)
+
+    claims = decode_claims(token)
+    user_id = int(claims["sub"])
+
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)) and exp > now:
+        with _lock:
+            _tokens[digest] = (float(exp), user_id)
+            _tokens.move_to_end(digest)
+            while len(_tokens) > TOKEN_CACHE_SIZE:
+                _tokens.popitem(last=False)
+    return user_id
+
+
+def load_user(db: Session, user_id: int) -> UserSnapshot | None:
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(user_id)
+        if entry and entry[0] > now:
+            _cache.move_to_end(user_id)
+            return entry[1]
+
+    row = (
+        db.query(User.id, User.email, User.is_admin, User.plan_id, Plan)
+        .outerjoin(Plan, Plan.id == User.plan_id)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not row:
+        return None  # not cached: a user created right after stays visible
+
+    uid, email, is_admin, plan_id, plan = row
+    snap = UserSnapshot(
+        id=uid,
+        email=email,
+        is_admin=bool(is_admin),
+        plan_id=plan_id,
+        plan=PlanSnapshot.from_row(plan) if plan else None,
+    )
+
+    if AUTH_CACHE_TTL > 0:
+        with _lock:
+            _cache[user_id] = (now + AUTH_CACHE_TTL, snap)
+            _cache.move_to_end(user_id)
+            while len(_cache) > AUTH_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return snap
+
+
+def invalidate_user(user_id: int):
+    with _lock:
+        _cache.pop(user_id, None)
+        for digest in [d for d, (_exp, uid) in _tokens.items() if uid == user_id]:
+            _tokens.pop(digest, None)
+
+
+def invalidate_plan(plan_id: int):
+    with _lock:
+        for uid in [uid for uid, (_exp, snap) in _cache.items() if snap.plan_id == plan_id]:
+            _cache.pop(uid, None)
+
+
+def clear_auth_cache():
+    with _lock:
+        _cache.clear()
+        _tokens.clear()
+
+
+# ---------------- cross-process invalidation (Postgres LISTEN/NOTIFY) ----------------
+
+CHANNEL = "auth_invalidate"
+
+
+def notify_user_changed(db: Session, user_id: int):
+    """
+    Call before committing a change to the user (plan, deletion).
+    """
+    invalidate_user(user_id)
+    notify(db, CHANNEL, f"user:{user_id}")
+
+
+def notify_plan_changed(db: Session, plan_id: int):
+    """
+    Call before committing a change to a plan's limits/flags.
+    """
+    invalidate_plan(plan_id)
+    notify(db, CHANNEL, f"plan:{plan_id}")
+
+
+def _apply(payload: str):
+    kind, _, raw_id = (payload or "").partition(":")
+    try:
+        obj_id = int(raw_id)
+    except ValueError:
+        clear_auth_cache()  # unknown message: be safe
+        return
+    if kind == "user":
+        invalidate_user(obj_id)
+    elif kind == "plan":
+        invalidate_plan(obj_id)
+    else:
+        clear_auth_cache()
+
+
+# (re)connected: anything sent while the listener was away is unknown
+_listener = PgListener(CHANNEL, _apply, on_connect=clear_auth_cache, name="auth-cache-listener")
+
+
+def start_auth_listener():
+    """
+    Cross-process invalidation; no-op on SQLite (TTL is the only bound there).
+    """
+    _listener.start()
+
+
+def stop_auth_listener():
+    _listener.stop()
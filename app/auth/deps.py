@@ -2,8 +2,7 @@ from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.core.security import decode_token
-from app.users.models import User
+from app.auth.cache import decode_token_cached, load_user
 
 bearer = HTTPBearer(auto_error=False)
 
@@ -14,10 +13,11 @@ def get_current_user(
     if not creds:
         raise HTTPException(status_code=401, detail="Missing token")
     try:
-        user_id = decode_token(creds.credentials)
+        user_id = decode_token_cached(creds.credentials)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
-    user = db.query(User).filter(User.id == user_id).first()
+    # cached UserSnapshot (user + plan, one joined query per TTL)
+    user = load_user(db, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
\ No newline at end of file
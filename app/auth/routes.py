@@ -1,10 +1,12 @@
 from pydantic import BaseModel, EmailStr
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.users.models import User
 from app.plans.models import Plan
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import create_access_token, needs_rehash
+from app.core.password_pool import hash_password_async, verify_password_async
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -12,36 +14,60 @@ class AuthBody(BaseModel):
     email: EmailStr
     password: str
 
+# async handlers: PBKDF2 runs in the bounded password pool (503 when saturated),
+# DB work in the regular threadpool -> auth bursts can't starve other endpoints
+
 @router.post("/register")
-def register(body: AuthBody, db: Session = Depends(get_db)):
+async def register(body: AuthBody, db: Session = Depends(get_db)):
     email = body.email.lower().strip()
     password = body.password
 
-    if db.query(User).filter(User.email == email).first():
-        raise HTTPException(status_code=400, detail="Email already exists")
+    def _precheck():
+        if db.query(User.id).filter(User.email == email).first():
+            raise HTTPException(status_code=400, detail="Email already exists")
+        free_plan = db.query(Plan.id).filter(Plan.name == "free").first()
+        if not free_plan:
+            raise HTTPException(status_code=500, detail="Plans not seeded")
+        return free_plan.id
 
-    free_plan = db.query(Plan).filter(Plan.name == "free").first()
-    if not free_plan:
-        raise HTTPException(status_code=500, detail="Plans not seeded")
+    free_plan_id = await run_in_threadpool(_precheck)
 
     try:
-        pwd_hash = hash_password(password)
+        pwd_hash = await hash_password_async(password)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    user = User(email=email, password_hash=pwd_hash, plan_id=free_plan.id)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return {"access_token": create_access_token(user.id)}
+    def _create():
+        user = User(email=email, password_hash=pwd_hash, plan_id=free_plan_id)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user.id
+
+    user_id = await run_in_threadpool(_create)
+    return {"access_token": create_access_token(user_id)}
 
 @router.post("/login")
-def login(body: AuthBody, db: Session = Depends(get_db)):
+async def login(body: AuthBody, db: Session = Depends(get_db)):
     email = body.email.lower().strip()
     password = body.password
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password_hash):
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
+    if not user or not await verify_password_async(password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    return {"access_token": create_access_token(user.id)}
\ No newline at end of file
+    # transparent upgrade when PBKDF2 parameters changed since this hash was made
+    if needs_rehash(user.password_hash):
+        try:
+            new_hash = await hash_password_async(password)
+        except (HTTPException, ValueError):
+            new_hash = None  # pool busy / legacy password rule: upgrade on a later login
+
+        if new_hash:
+            def _store():
+                user.password_hash = new_hash
+                db.commit()
+
+            await run_in_threadpool(_store)
+
+    return {"access_token": create_access_token(user.id)}
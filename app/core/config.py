@@ -44,4 +44,79 @@ JWT_SECRET = _clean(os.getenv("JWT_SECRET")) or "dev-secret"
 try:
     JWT_EXPIRE_MIN = int(_clean(os.getenv("JWT_EXPIRE_MIN")) or "30")
 except ValueError:
-    JWT_EXPIRE_MIN = 30
\ No newline at end of file
+    JWT_EXPIRE_MIN = 30
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(_clean(os.getenv(name)) or str(default))
+    except ValueError:
+        return default
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(_clean(os.getenv(name)) or str(default))
+    except ValueError:
+        return default
+
+
+# Scan worker pool: concurrent scan slots per plan class
+# - priority slots: only paid (plan.priority_queue=True) scans
+# - standard slots: free scans first (FIFO), paid only overflow into idle ones
+SCAN_WORKER_PRIORITY_SLOTS = max(0, _int_env("SCAN_WORKER_PRIORITY_SLOTS", 2))
+SCAN_WORKER_STANDARD_SLOTS = max(0, _int_env("SCAN_WORKER_STANDARD_SLOTS", 2))
+# enqueue wakes workers directly; this is only the fallback DB poll
+SCAN_WORKER_POLL_SECONDS = max(0.1, _float_env("SCAN_WORKER_POLL_SECONDS", 30.0))
+# how long shutdown waits for running scans before stopping them (marked failed)
+SCAN_WORKER_DRAIN_SECONDS = max(0.0, _float_env("SCAN_WORKER_DRAIN_SECONDS", 30.0))
+
+
+# Crawler: total in-flight fetches, and the window per host
+CRAWL_CONCURRENCY = max(1, _int_env("CRAWL_CONCURRENCY", 16))
+CRAWL_HOST_CONCURRENCY = max(1, _int_env("CRAWL_HOST_CONCURRENCY", 8))
+# crawled pages are written to scan_pages in batches of N
+CRAWL_FLUSH_PAGES = max(1, _int_env("CRAWL_FLUSH_PAGES", 200))
+# only the first N bytes of an HTML page are parsed for links
+CRAWL_MAX_HTML_BYTES = max(1024, _int_env("CRAWL_MAX_HTML_BYTES", 2 * 1024 * 1024))
+
+# Outbound HTTP (app/ssrf/http.py): pooled keep-alive clients
+HTTP_MAX_CONNECTIONS = max(1, _int_env("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE = max(0, _int_env("HTTP_MAX_KEEPALIVE", 20))
+HTTP2_ENABLED = _clean(os.getenv("HTTP2_ENABLED")) == "1"  # needs the "h2" package
+
+# SSRF guard DNS cache (seconds / entries)
+DNS_CACHE_TTL = max(0.0, _float_env("DNS_CACHE_TTL", 60.0))
+DNS_NEGATIVE_TTL = max(0.0, _float_env("DNS_NEGATIVE_TTL", 10.0))
+DNS_CACHE_SIZE = max(1, _int_env("DNS_CACHE_SIZE", 4096))
+
+# Rendered report cache (app/reports/cache.py)
+REPORT_CACHE_DIR = _clean(os.getenv("REPORT_CACHE_DIR")) or "./report_cache"
+REPORT_CACHE_MAX_MB = max(1, _int_env("REPORT_CACHE_MAX_MB", 512))
+# processes rendering reports in the background when a scan finishes (0 = off)
+REPORT_RENDER_PROCESSES = max(0, _int_env("REPORT_RENDER_PROCESSES", 2))
+
+# Per-process cache of authenticated user + plan (app/auth/cache.py)
+AUTH_CACHE_TTL = max(0.0, _float_env("AUTH_CACHE_TTL", 30.0))
+AUTH_CACHE_SIZE = max(1, _int_env("AUTH_CACHE_SIZE", 10000))
+# verified JWTs (by digest) kept until their exp
+TOKEN_CACHE_SIZE = max(1, _int_env("TOKEN_CACHE_SIZE", 10000))
+
+# PBKDF2 hashing pool (app/core/password_pool.py): threads + max queued/running jobs before 503
+PASSWORD_HASH_THREADS = max(1, _int_env("PASSWORD_HASH_THREADS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = max(1, _int_env("PASSWORD_HASH_MAX_PENDING", 32))
+
+# Site ownership re-verification sweeper (app/sites/reverify.py)
+SITE_REVERIFY_INTERVAL_SECONDS = max(60.0, _float_env("SITE_REVERIFY_INTERVAL_SECONDS", 3600.0))
+# verified sites older than this are re-checked by the sweeper
+SITE_REVERIFY_AFTER_HOURS = max(1.0, _float_env("SITE_REVERIFY_AFTER_HOURS", 24.0))
+# advanced scans need verification younger than this; failed re-checks unverify after it
+SITE_VERIFICATION_MAX_AGE_HOURS = max(1.0, _float_env("SITE_VERIFICATION_MAX_AGE_HOURS", 72.0))
+SITE_REVERIFY_BATCH = max(1, _int_env("SITE_REVERIFY_BATCH", 200))
+SITE_REVERIFY_CONCURRENCY = max(1, _int_env("SITE_REVERIFY_CONCURRENCY", 10))
+
+# Recurring scan scheduler (app/scans/scheduler.py)
+SCHEDULER_POLL_SECONDS = max(5.0, _float_env("SCHEDULER_POLL_SECONDS", 30.0))
+SCHEDULER_BATCH = max(1, _int_env("SCHEDULER_BATCH", 200))
+SCHEDULER_DEFAULT_JITTER_SECONDS = max(0, _int_env("SCHEDULER_DEFAULT_JITTER_SECONDS", 600))
+SCHEDULE_MIN_INTERVAL_MINUTES = max(1, _int_env("SCHEDULE_MIN_INTERVAL_MINUTES", 60))
@@ -0,0 +1,87 @@
+# backend/app/core/password_pool.py
+
+"""
+Dedicated, bounded thread pool for PBKDF2 hashing / verification.
+
+210k PBKDF2 iterations cost tens of ms of CPU each; run in FastAPI's shared
+threadpool, a login burst would queue every other sync endpoint behind them.
+Here auth gets its own PASSWORD_HASH_THREADS threads (hashlib releases the GIL
+while deriving), and at most PASSWORD_HASH_MAX_PENDING jobs may be queued or
+running: beyond that requests fail fast with 503 + Retry-After instead of piling up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.core.config import PASSWORD_HASH_THREADS, PASSWORD_HASH_MAX_PENDING
+from app.core.security import hash_password, verify_password
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_THREADS, thread_name_prefix="pbkdf2")
+_lock = threading.Lock()
+_in_flight = 0
+_completed = 0
+_rejected = 0
+
+
+def _acquire():
+    global _in_flight, _rejected
+    with _lock:
+        if _in_flight >= PASSWORD_HASH_MAX_PENDING:
+            _rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Authentication is busy, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _in_flight += 1
+
+
+def _release():
+    global _in_flight, _completed
+    with _lock:
+        _in_flight -= 1
+        _completed += 1
+
+
+async def _run(fn, *args):
+    _acquire()
+    try:
+        fut = _executor.submit(fn, *args)
+    except BaseException:
+        _release()
+        raise
+    # released when the PBKDF2 thread finishes, not when the awaiting request
+    # does: a cancelled request (disconnect/timeout) keeps its slot until the
+    # work it started is really done, so the bound covers running work
+    fut.add_done_callback(lambda _f: _release())
+    return await asyncio.wrap_future(fut)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    return await _run(verify_password, password, stored)
+
+
+def password_pool_stats() -> dict:
+    with _lock:
+        in_flight, completed, rejected = _in_flight, _completed, _rejected
+    return {
+        "threads": PASSWORD_HASH_THREADS,
+        "max_pending": PASSWORD_HASH_MAX_PENDING,
+        "in_flight": in_flight,
+        "queued": max(0, in_flight - PASSWORD_HASH_THREADS),
+        "completed": completed,
+        "rejected": rejected,
+    }
+
+
+def shutdown_password_pool():
+    _executor.shutdown(wait=False, cancel_futures=True)
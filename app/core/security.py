@@ -54,11 +54,29 @@ def verify_password(password: str, stored: str) -> bool:
     except Exception:
         return False
 
+def needs_rehash(stored: str) -> bool:
+    """
+    True if a (verified) hash was made with another algorithm or iteration count:
+    login then re-hashes with the current PBKDF2 settings.
+    """
+    try:
+        algo, iters, _salt_b64, hash_b64 = stored.split("$", 3)
+        return (
+            algo != "pbkdf2_sha256"
+            or int(iters) != PBKDF2_ITERATIONS
+            or len(base64.b64decode(hash_b64.encode("ascii"))) != DKLEN
+        )
+    except Exception:
+        return True
+
 def create_access_token(user_id: int) -> str:
     exp = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MIN)
     payload = {"sub": str(user_id), "exp": exp}
     return jwt.encode(payload, JWT_SECRET, algorithm=ALGO)
 
+def decode_claims(token: str) -> dict:
+    # verifies signature + exp
+    return jwt.decode(token, JWT_SECRET, algorithms=[ALGO])
+
 def decode_token(token: str) -> int:
-    payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGO])
-    return int(payload["sub"])
\ No newline at end of file
+    return int(decode_claims(token)["sub"])
\ No newline at end of file
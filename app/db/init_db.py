@@ -1,3 +1,5 @@
+from sqlalchemy import inspect, text
+
 from app.db.session import engine
 from app.db.base import Base
 
@@ -8,6 +10,36 @@ from app.sites.models import Site  # noqa
 from app.sites.ownership_models import OwnershipToken  # noqa
 from app.scans.models import Scan  # noqa
 from app.scans.pages_models import ScanPage  # noqa
+from app.scans.schedule_models import ScanSchedule  # noqa
+from app.reports.models import ReportEvent, ReportShareLink  # noqa
+
+def _add_missing_columns():
+    """
+    create_all() never alters existing tables (no Alembic in this MVP),
+    so add new nullable columns to tables created by older versions.
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in existing:
+                    continue
+                ddl = col.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {ddl}"))
+
+
+def _add_missing_indexes():
+    # same story for indexes added to models later
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for idx in table.indexes:
+                idx.create(bind=conn, checkfirst=True)
+
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _add_missing_indexes()
\ No newline at end of file
@@ -0,0 +1,75 @@
+# backend/app/db/locks.py
+
+"""
+Cluster-wide leader locks for background loops (one sweeper/scheduler per fleet).
+
+Postgres: session-level pg_try_advisory_lock on a dedicated connection, held
+until release() (or until that connection dies, so a crashed leader frees it).
+SQLite: single-node by nature -> acquire() always succeeds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.session import engine
+
+
+def lock_key(name: str) -> int:
+    # stable signed 64-bit key from a readable name
+    return int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+class AdvisoryLock:
+    """
+    Non-blocking: acquire() returns False if another process is the leader.
+    Blocking DB calls -> from async code use asyncio.to_thread(lock.acquire).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = lock_key(name)
+        self._conn: Connection | None = None
+        self.held = False
+
+    def acquire(self) -> bool:
+        if self.held:
+            return True
+        if engine.dialect.name != "postgresql":
+            self.held = True
+            return True
+
+        conn = engine.connect()
+        try:
+            got = bool(conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": self.key}).scalar())
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not got:
+            conn.close()
+            return False
+
+        self._conn = conn
+        self.held = True
+        return True
+
+    def release(self):
+        conn, self._conn = self._conn, None
+        self.held = False
+        if conn is None:
+            return
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": self.key})
+            conn.commit()
+        finally:
+            conn.close()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,94 @@
+# backend/app/db/notify.py
+
+"""
+Postgres LISTEN/NOTIFY for cross-process signals (scan queue wake-ups, auth
+cache invalidation).
+
+notify(): pg_notify on the caller's session, delivered when it commits.
+PgListener: a daemon thread with its own connection LISTENing on one channel;
+on_notify(payload) runs in that thread for every message, on_connect() after
+each (re)connect, since messages sent while disconnected are lost.
+SQLite has no cross-process channel: both are no-ops there.
+"""
+
+from __future__ import annotations
+
+import select
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+
+RECONNECT_SECONDS = 5.0
+
+
+def notify(db: Session, channel: str, payload: str = ""):
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    # transactional: listeners get it when the caller commits
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+class PgListener:
+    """
+    start() is idempotent while the thread runs; stop() ends it within ~5s.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        *,
+        on_connect: Callable[[], None] | None = None,
+        name: str | None = None,
+    ):
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_connect = on_connect
+        self.name = name or f"{channel}-listener"
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if engine.dialect.name != "postgresql":
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen_forever, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _listen_forever(self):
+        while not self._stop.is_set():
+            try:
+                raw = engine.raw_connection()
+            except Exception:
+                time.sleep(RECONNECT_SECONDS)
+                continue
+
+            try:
+                conn = raw.driver_connection  # psycopg2 connection
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                if self.on_connect:
+                    self.on_connect()
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.on_notify(conn.notifies.pop(0).payload)
+            except Exception:
+                time.sleep(RECONNECT_SECONDS)
+            finally:
+                # don't hand an autocommit/LISTEN connection back to the pool
+                raw.invalidate()
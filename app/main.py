@@ -24,9 +24,17 @@ from app.sites.routes_verification import router as sites_verif_router
 from app.scans.routes import router as scans_router
 from app.scans.detail_routes import router as scans_detail_router
 from app.scans.pages_routes import router as scans_pages_router
+from app.scans.events_routes import router as scans_events_router
+from app.scans.schedule_routes import router as scans_schedule_router
 
 from app.scans.cleanup import auto_cleanup_scans
-from app.scans.worker import scans_worker_loop
+from app.scans.worker import scans_worker_loop, shutdown_scans_worker
+from app.sites.reverify import reverify_loop
+from app.scans.scheduler import scheduler_loop
+from app.ssrf.http import close_client, close_async_client
+from app.reports.prerender import shutdown_prerender
+from app.auth.cache import start_auth_listener, stop_auth_listener
+from app.core.password_pool import password_pool_stats, shutdown_password_pool
 
 try:
     from app.reports.routes import router as reports_router
@@ -79,7 +87,24 @@ async def on_startup():
     finally:
         db.close()
 
-    asyncio.create_task(scans_worker_loop(poll_seconds=1.0))
+    start_auth_listener()
+    app.state.scans_worker = asyncio.create_task(scans_worker_loop())
+    app.state.sites_reverify = asyncio.create_task(reverify_loop())
+    app.state.scans_scheduler = asyncio.create_task(scheduler_loop())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # ✅ graceful drain: stop claiming, wait for running scans
+    await shutdown_scans_worker()
+    app.state.scans_worker.cancel()
+    app.state.sites_reverify.cancel()
+    app.state.scans_scheduler.cancel()
+    close_client()
+    await close_async_client()
+    shutdown_prerender()
+    shutdown_password_pool()
+    stop_auth_listener()
 
 
 app.include_router(auth_router)
@@ -89,6 +114,8 @@ app.include_router(sites_verif_router)
 app.include_router(scans_detail_router)
 app.include_router(scans_router)
 app.include_router(scans_pages_router)
+app.include_router(scans_events_router)
+app.include_router(scans_schedule_router)
 
 if reports_router:
     app.include_router(reports_router)
@@ -96,7 +123,7 @@ if reports_router:
 
 @app.get("/health")
 def health():
-    return {"ok": True}
+    return {"ok": True, "password_pool": password_pool_stats()}
 
 
 @app.get("/")
@@ -6,6 +6,10 @@ from app.users.models import User
 
 
 def get_user_plan(db: Session, user: User) -> Plan:
+    # UserSnapshot from get_current_user already carries its plan
+    cached = getattr(user, "plan", None)
+    if cached is not None:
+        return cached
     plan = db.query(Plan).filter(Plan.id == user.plan_id).first()
     if not plan:
         raise HTTPException(status_code=500, detail="Plan missing")
@@ -0,0 +1,99 @@
+# backend/app/plans/quotas.py
+
+"""
+24h sliding-window quotas for scans and reports.
+
+Each check is one COUNT over a composite index range:
+  scans          (user_id, created_at)        -> ix_scans_user_created
+  report_events  (user_id, kind, created_at)  -> ix_report_events_user_kind_created
+and the count is capped at the plan limit (inner LIMIT), so a check never
+reads more than `limit` index entries, however much history a user has.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.plans.models import Plan
+from app.scans.models import Scan
+from app.reports.models import ReportEvent
+
+WINDOW = timedelta(hours=24)
+
+FREE_SCANS_PER_24H = 3
+PAID_SCANS_PER_24H = 200
+
+FREE_REPORTS_PER_24H = 3
+PAID_REPORTS_PER_24H = 200
+PAID_EMAILS_PER_24H = 50
+
+
+def _window_start() -> datetime:
+    return datetime.now(timezone.utc) - WINDOW
+
+
+def _count_capped(db: Session, stmt, cap: int) -> int:
+    # COUNT(*) FROM (SELECT 1 ... LIMIT cap): stops scanning the index at `cap`
+    sub = stmt.limit(max(0, cap)).subquery()
+    return db.execute(select(func.count()).select_from(sub)).scalar() or 0
+
+
+def scans_used(db: Session, user_id: int, *, cap: int) -> int:
+    stmt = select(Scan.id).where(Scan.user_id == user_id, Scan.created_at >= _window_start())
+    return _count_capped(db, stmt, cap)
+
+
+def reports_used(db: Session, user_id: int, kind: str, *, cap: int) -> int:
+    stmt = select(ReportEvent.id).where(
+        ReportEvent.user_id == user_id,
+        ReportEvent.kind == kind,
+        ReportEvent.created_at >= _window_start(),
+    )
+    return _count_capped(db, stmt, cap)
+
+
+def scan_limit(plan: Plan) -> int:
+    return FREE_SCANS_PER_24H if plan.name == "free" else PAID_SCANS_PER_24H
+
+
+def report_limit(plan: Plan, kind: str) -> int:
+    if kind == "pdf_email":
+        return 0 if plan.name == "free" else PAID_EMAILS_PER_24H
+    return FREE_REPORTS_PER_24H if plan.name == "free" else PAID_REPORTS_PER_24H
+
+
+def enforce_scan_quota(db: Session, user_id: int, plan: Plan):
+    """
+    Free: 3 scans / 24h
+    Paid: 200 scans / 24h
+    (count all scan types)
+    """
+    limit = scan_limit(plan)
+    used = scans_used(db, user_id, cap=limit)
+    if used >= limit:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit: {limit} scans per 24h (used={used}).",
+        )
+
+
+def enforce_report_quota(db: Session, user_id: int, plan: Plan, *, kind: str, count: int = 1):
+    """
+    Free: 3 reports / 24h
+    Paid: 200 reports / 24h
+    Paid email: 50 / 24h (kind="pdf_email")
+    Counted per kind: pdf, pdf_download, json, html, csv each have their own window.
+    count: reports about to be produced (a bundle checks all of them at once,
+    against the same kind as downloading them one by one).
+    """
+    limit = report_limit(plan, kind)
+    used = reports_used(db, user_id, kind, cap=limit)
+    if used + count > limit:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Report limit reached: {limit} per 24h on your plan",
+        )
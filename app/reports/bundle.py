@@ -0,0 +1,122 @@
+# backend/app/reports/bundle.py
+
+"""
+Multi-scan report bundles: render many reports in parallel, stream them as one ZIP.
+
+Cached artifacts are reused as-is (opened right away, so eviction can't remove
+them before they are zipped); misses are rendered in the prerender process
+pool (one scan per process) and only fall back to an inline render when the
+pool is disabled or a pool render failed.
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from typing import BinaryIO, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.reports import cache as report_cache
+from app.reports.pipeline import ReportData, render_report
+from app.reports.prerender import submit_prerender
+
+ZIP_CHUNK_BYTES = 64 * 1024
+
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def render_bundle(db: Session, items: list[ReportData], *, fmt: str = "pdf") -> list[BinaryIO]:
+    """
+    Returns one open file per item (caller closes them), in items order.
+    """
+    files: dict[int, BinaryIO] = {}
+    futures = {}
+
+    try:
+        for data in items:
+            f = report_cache.open_cached(data.scan.id, data.key(fmt), fmt)
+            if f is not None:
+                files[data.scan.id] = f
+                continue
+            fut = submit_prerender(data.scan.id, fmt)
+            if fut is not None:
+                futures[data.scan.id] = fut
+
+        for data in items:
+            sid = data.scan.id
+            if sid in files:
+                continue
+            fut = futures.get(sid)
+            if fut is not None:
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"[bundle] pool render of scan {sid} failed: {e!r}")
+                f = report_cache.open_cached(sid, data.key(fmt), fmt)
+                if f is not None:
+                    files[sid] = f
+                    continue
+            # pool disabled / failed / evicted meanwhile: render here
+            files[sid] = render_report(db, data, fmt=fmt, wait_prerender=True)
+    except Exception:
+        for f in files.values():
+            f.close()
+        raise
+
+    return [files[data.scan.id] for data in items]
+
+
+def arcname(data: ReportData, fmt: str) -> str:
+    domain = _SAFE_NAME_RE.sub("_", data.site.domain or f"site-{data.site.id}")
+    return f"{domain}-scan-{data.scan.id}.{fmt}"
+
+
+class _ZipSink:
+    """
+    Write-only, non-seekable target: zipfile then emits data descriptors and the
+    generator below hands out whatever has been written since the last chunk.
+    """
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def write(self, b) -> int:
+        self.buf += b
+        return len(b)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        out = bytes(self.buf)
+        self.buf.clear()
+        return out
+
+
+def iter_zip(entries: list[tuple[str, BinaryIO]], *, compress: bool) -> Iterator[bytes]:
+    """
+    entries: (name, open file). Files are opened by the caller before streaming
+    starts, so cache eviction during the download cannot break the bundle.
+    """
+    sink = _ZipSink()
+    method = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    try:
+        with zipfile.ZipFile(sink, "w", compression=method) as zf:
+            for name, f in entries:
+                with zf.open(name, "w") as dst:
+                    while True:
+                        chunk = f.read(ZIP_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                        if sink.buf:
+                            yield sink.take()
+                f.close()
+                if sink.buf:
+                    yield sink.take()
+        if sink.buf:
+            yield sink.take()
+    finally:
+        for _name, f in entries:
+            f.close()
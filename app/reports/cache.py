@@ -0,0 +1,137 @@
+# backend/app/reports/cache.py
+
+"""
+Content-addressed on-disk cache for rendered reports (LRU by mtime, size-capped).
+
+A finished scan never changes, so a report is fully determined by:
+scan id + status + finished_at + the site fields it shows (url, domain,
+verification) + include_pages + plan name + template version.
+A re-run changes finished_at -> new key; invalidate_scan() drops old files early.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+from app.core.config import REPORT_CACHE_DIR, REPORT_CACHE_MAX_MB
+
+# bump whenever the report layout changes, so old artifacts stop matching
+REPORT_TEMPLATE_VERSION = "2"
+
+CACHE_DIR = Path(REPORT_CACHE_DIR)
+MAX_BYTES = REPORT_CACHE_MAX_MB * 1024 * 1024
+
+_evict_lock = threading.Lock()
+
+
+def report_key(scan, site, *, include_pages: bool, plan_name: str, fmt: str = "pdf") -> str:
+    finished = scan.finished_at.isoformat() if scan.finished_at else ""
+    verified = site.verified_at.isoformat() if site.verified_at else ""
+    raw = "|".join(
+        [
+            fmt,
+            str(scan.id),
+            str(scan.status),
+            finished,
+            # the report shows the site block: re-verification / edits change it
+            str(site.url),
+            str(site.domain),
+            str(bool(site.is_verified)),
+            verified,
+            "pages" if include_pages else "nopages",
+            str(plan_name),
+            REPORT_TEMPLATE_VERSION,
+        ]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def cache_path(scan_id: int, key: str, fmt: str = "pdf") -> Path:
+    return CACHE_DIR / f"scan-{scan_id}-{key[:40]}.{fmt}"
+
+
+def open_cached(scan_id: int, key: str, fmt: str = "pdf") -> BinaryIO | None:
+    """
+    Cached artifact as an open file, or None on a miss.
+    Returning the handle (not a path) closes the race with _evict(): once open,
+    the file stays readable even if eviction unlinks it meanwhile.
+    """
+    path = cache_path(scan_id, key, fmt)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # LRU: mark as recently used
+    except OSError:
+        pass  # evicted right after open: the handle is still valid
+    return f
+
+
+def put_file(scan_id: int, key: str, write: Callable[[BinaryIO], None], fmt: str = "pdf") -> BinaryIO:
+    """
+    write(f) renders straight into a temp file in the cache dir, which is then
+    renamed into place: readers never see a half-written file and the artifact
+    is never held in memory as one bytes object.
+    Returns the stored artifact opened for reading (opened before eviction runs).
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = cache_path(scan_id, key, fmt)
+
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+        out = open(path, "rb")
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+    _evict()
+    return out
+
+
+def invalidate_scan(scan_id: int):
+    for path in CACHE_DIR.glob(f"scan-{scan_id}-*"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _evict():
+    if not _evict_lock.acquire(blocking=False):
+        return  # another thread is already trimming
+    try:
+        files = []
+        total = 0
+        for path in CACHE_DIR.glob("scan-*"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total <= MAX_BYTES:
+            return
+
+        for _mtime, size, path in sorted(files):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= MAX_BYTES:
+                break
+    finally:
+        _evict_lock.release()
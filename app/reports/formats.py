@@ -0,0 +1,206 @@
+# backend/app/reports/formats.py
+
+"""
+Lightweight report backends (JSON / HTML / CSV) for the report pipeline.
+
+Same writer(out, data, pages) contract as pdf.write_pdf, but plain text output:
+no reportlab, a fraction of the CPU of a PDF render. `pages` may be a lazy row
+iterator; every writer streams it row by row into `out`.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import timezone
+from html import escape
+from typing import BinaryIO, Iterable
+
+SEC_HEADER_KEYS = [
+    "strict-transport-security",
+    "content-security-policy",
+    "x-frame-options",
+    "x-content-type-options",
+    "referrer-policy",
+    "permissions-policy",
+]
+
+
+def _iso(dt) -> str | None:
+    if not dt:
+        return None
+    if getattr(dt, "tzinfo", None) is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def report_dict(data) -> dict:
+    """
+    Machine-readable report body (everything but the pages appendix).
+    """
+    scan = data.scan
+    site = data.site
+    return {
+        "plan": data.plan.name,
+        "scan": {
+            "id": scan.id,
+            "type": scan.scan_type,
+            "status": scan.status,
+            "created_at": _iso(scan.created_at),
+            "started_at": _iso(scan.started_at),
+            "finished_at": _iso(scan.finished_at),
+            "error": scan.error,
+        },
+        "site": {
+            "id": site.id,
+            "url": site.url,
+            "domain": site.domain,
+            "is_verified": bool(site.is_verified),
+            "verified_at": _iso(site.verified_at),
+        },
+        "security_headers": {k: data.sec_headers.get(k) for k in SEC_HEADER_KEYS},
+        "tls": data.tls,
+        "crawl": data.crawl,
+        "risk": data.risk,
+        "findings": data.findings,
+        "top_fixes": data.fixes,
+    }
+
+
+def _page_dict(p) -> dict:
+    return {"url": p.url, "status_code": p.status_code, "created_at": _iso(p.created_at)}
+
+
+def write_json(out: BinaryIO, data, pages: Iterable) -> None:
+    body = json.dumps(report_dict(data), ensure_ascii=False, default=str)
+    if not data.include_pages:
+        out.write(body.encode("utf-8"))
+        return
+
+    # stream the appendix: reopen the object and append "pages" one row at a time
+    out.write(body[:-1].encode("utf-8"))
+    out.write(b', "pages": [')
+    first = True
+    for p in pages:
+        if not first:
+            out.write(b", ")
+        first = False
+        out.write(json.dumps(_page_dict(p), ensure_ascii=False).encode("utf-8"))
+    out.write(b"]}")
+
+
+def write_csv(out: BinaryIO, data, pages: Iterable) -> None:
+    """
+    One row per finding, then (paid) one row per crawled page.
+    """
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    try:
+        w = csv.writer(text)
+        w.writerow(["section", "severity", "id", "title", "evidence", "url", "status_code"])
+        for f in data.findings:
+            f = f or {}
+            w.writerow([
+                "finding",
+                (f.get("severity") or "info").lower(),
+                f.get("id") or "",
+                f.get("title") or "",
+                f.get("evidence") or "",
+                "",
+                "",
+            ])
+        if data.include_pages:
+            for p in pages:
+                w.writerow(["page", "", "", "", "", p.url, p.status_code if p.status_code is not None else ""])
+        text.flush()
+    finally:
+        text.detach()  # leave `out` open for the caller
+
+
+def _kv_rows(items) -> str:
+    return "".join(
+        f"<tr><th>{escape(str(k))}</th><td>{escape(str(v if v is not None else '-'))}</td></tr>"
+        for k, v in items
+    )
+
+
+def write_html(out: BinaryIO, data, pages: Iterable) -> None:
+    scan = data.scan
+    site = data.site
+    risk = data.risk
+    counts = risk.get("counts") or {}
+
+    def emit(s: str):
+        out.write(s.encode("utf-8"))
+
+    emit(
+        "<!doctype html><html><head><meta charset=\"utf-8\">"
+        f"<title>SaaS Scanner Report - scan {scan.id}</title>"
+        "<style>body{font-family:Arial,sans-serif;line-height:1.4;max-width:960px;margin:2em auto}"
+        "table{border-collapse:collapse;margin-bottom:1.5em}th,td{text-align:left;padding:2px 10px 2px 0;"
+        "vertical-align:top}th{font-weight:600}code{word-break:break-all}</style></head><body>"
+        "<h1>SaaS Scanner Report</h1>"
+    )
+
+    emit("<table>" + _kv_rows([
+        ("Plan", data.plan.name),
+        ("Scan ID", scan.id),
+        ("Type", scan.scan_type),
+        ("Status", scan.status),
+        ("Created", _iso(scan.created_at)),
+        ("Started", _iso(scan.started_at)),
+        ("Finished", _iso(scan.finished_at)),
+    ]) + "</table>")
+
+    emit("<h2>Site</h2><table>" + _kv_rows([
+        ("URL", site.url),
+        ("Domain", site.domain),
+        ("Verified", bool(site.is_verified)),
+        ("Verified At", _iso(site.verified_at)),
+    ]) + "</table>")
+
+    emit("<h2>Security Headers</h2><table>"
+         + _kv_rows((k, data.sec_headers.get(k) or "-") for k in SEC_HEADER_KEYS) + "</table>")
+    emit("<h2>TLS</h2><table>"
+         + _kv_rows((k, data.tls.get(k)) for k in ["enabled", "protocol", "cipher", "notBefore", "notAfter"])
+         + "</table>")
+    emit("<h2>Crawl</h2><table>"
+         + _kv_rows((k, data.crawl.get(k)) for k in ["visited", "unique_seen", "time_spent_sec"]) + "</table>")
+
+    cnt_line = " / ".join(f"{k}:{counts.get(k, 0)}" for k in ["critical", "high", "medium", "low", "info"])
+    emit("<h2>Risk Score</h2><table>" + _kv_rows([
+        ("Score (0-100)", risk.get("score", 0)),
+        ("Level", risk.get("label", "-")),
+        ("Counts", cnt_line),
+    ]) + "</table>")
+
+    emit("<h2>Findings</h2>")
+    if not data.findings:
+        emit("<p>- none -</p>")
+    else:
+        emit("<ul>")
+        for f in data.findings:
+            sev = (f.get("severity") or "info").lower()
+            emit(
+                f"<li><b>[{escape(sev)}]</b> {escape(str(f.get('title')))} ({escape(str(f.get('id')))})"
+                f"<br><code>evidence: {escape(str(f.get('evidence') or '-'))}</code></li>"
+            )
+        emit("</ul>")
+
+    emit("<h2>Top Fixes</h2>")
+    if not data.fixes:
+        emit("<p>- none -</p>")
+    else:
+        emit("<ul>" + "".join(f"<li>{escape(fx)}</li>" for fx in data.fixes) + "</ul>")
+
+    if data.include_pages:
+        emit("<h2>Appendix: Pages</h2><table>")
+        empty = True
+        for p in pages:
+            empty = False
+            emit(f"<tr><td>{escape(str(p.status_code or '-'))}</td><td><code>{escape(p.url)}</code></td></tr>")
+        if empty:
+            emit("<tr><td>- none -</td></tr>")
+        emit("</table>")
+
+    emit("</body></html>")
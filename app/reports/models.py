@@ -1,6 +1,6 @@
 # backend/app/reports/models.py
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -18,6 +18,11 @@ class ReportEvent(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
+    __table_args__ = (
+        # 24h report quota: WHERE user_id=? AND kind=? AND created_at >= now-24h
+        Index("ix_report_events_user_kind_created", "user_id", "kind", "created_at"),
+    )
+
 
 class ReportShareLink(Base):
     __tablename__ = "report_share_links"
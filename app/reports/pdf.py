@@ -1,125 +1,116 @@
+# backend/app/reports/pdf.py
+
 from __future__ import annotations
 
-from io import BytesIO
 from datetime import timezone
-from typing import Any, Dict, List, Optional
+from typing import BinaryIO, Iterable
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.pdfgen import canvas
 
+from app.reports.wrap import wrap_text
+
 
 def _as_utc(dt):
-    if dt is None:
+    if not dt:
         return None
     if getattr(dt, "tzinfo", None) is None:
-        return dt.replace(tzinfo=timezone.utc)
+        dt = dt.replace(tzinfo=timezone.utc)
     return dt
 
 
-def _fmt_dt(dt) -> str:
+def _fmt(dt):
     dt = _as_utc(dt)
     if not dt:
         return "-"
     return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
 
 
-def _safe(obj, default=None):
-    return obj if obj is not None else default
+def _wrap_text(c: canvas.Canvas, text: str, max_width: float, font="Helvetica", size=10):
+    c.setFont(font, size)
+    return wrap_text(text, max_width, font=font, size=size)
 
 
-def _draw_kv(c: canvas.Canvas, x: float, y: float, label: str, value: str, max_width: float) -> float:
+def _draw_kv(c: canvas.Canvas, x, y, k, v, page_width, right_margin):
+    key_w = 110
+    max_val_w = (page_width - right_margin) - (x + key_w)
+
     c.setFont("Helvetica-Bold", 10)
-    c.drawString(x, y, f"{label}:")
-    c.setFont("Helvetica", 10)
+    c.drawString(x, y, f"{k}:")
 
-    text = value or "-"
-    # very simple wrap
-    words = text.split()
-    line = ""
-    lines = []
-    for w in words:
-        t = (line + " " + w).strip()
-        if c.stringWidth(t, "Helvetica", 10) <= max_width:
-            line = t
-        else:
-            if line:
-                lines.append(line)
-            line = w
-    if line:
-        lines.append(line)
+    c.setFont("Helvetica", 10)
+    lines = _wrap_text(c, "-" if v is None else v, max_val_w, font="Helvetica", size=10)
 
     yy = y
-    for ln in (lines or ["-"]):
-        c.drawString(x + 90, yy, ln)
-        yy -= 14
+    for ln in lines:
+        c.drawString(x + key_w, yy, ln)
+        yy -= 0.5 * cm
+
     return yy
 
 
-def build_scan_pdf(
-    *,
-    scan: Any,
-    site: Any,
-    plan_name: str,
-    pages: Optional[List[Dict[str, Any]]] = None,
-) -> bytes:
+def write_pdf(out: BinaryIO, data, pages: Iterable) -> None:
     """
-    scan: Scan model (id/status/type/timestamps/summary/error)
-    site: Site model (url/domain/is_verified/verified_at)
-    pages: list of {url,status_code,created_at}
+    PDF backend of the report pipeline (data: pipeline.ReportData).
+    Renders into `out` (a file). `pages` may be a lazy row iterator:
+    the appendix consumes it chunk by chunk and never builds a list.
     """
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
-    W, H = A4
-
-    margin = 2 * cm
-    x = margin
-    y = H - margin
-
-    def new_page():
+    plan_name = data.plan.name
+    scan = data.scan
+    site = data.site
+    sec_headers = data.sec_headers
+    tls = data.tls
+    crawl = data.crawl
+    include_pages = data.include_pages
+
+    c = canvas.Canvas(out, pagesize=A4)
+    w, h = A4
+
+    left = 2 * cm
+    right = 2 * cm
+    y = h - 2 * cm
+
+    def ensure_space(min_y=2.5 * cm):
         nonlocal y
-        c.showPage()
-        y = H - margin
+        if y < min_y:
+            c.showPage()
+            y = h - 2 * cm
 
-    # Header
+    # Title
     c.setFont("Helvetica-Bold", 16)
-    c.drawString(x, y, "SaaS Scanner Report")
-    y -= 20
+    c.drawString(left, y, "SaaS Scanner Report")
+    y -= 1.2 * cm
 
-    c.setFont("Helvetica", 10)
-    c.drawString(x, y, f"Plan: {plan_name}")
-    y -= 18
-
-    # Basics
-    y = _draw_kv(c, x, y, "Scan ID", str(scan.id), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Scan Type", str(scan.scan_type), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Status", str(scan.status), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Created At", _fmt_dt(scan.created_at), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Started At", _fmt_dt(scan.started_at), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Finished At", _fmt_dt(scan.finished_at), W - 2 * margin)
-    y -= 6
+    # Meta
+    y = _draw_kv(c, left, y, "Plan", plan_name, w, right)
+    y = _draw_kv(c, left, y, "Scan ID", scan.id, w, right)
+    y = _draw_kv(c, left, y, "Type", scan.scan_type, w, right)
+    y = _draw_kv(c, left, y, "Status", scan.status, w, right)
+    y = _draw_kv(c, left, y, "Created", _fmt(scan.created_at), w, right)
+    y = _draw_kv(c, left, y, "Started", _fmt(scan.started_at), w, right)
+    y = _draw_kv(c, left, y, "Finished", _fmt(scan.finished_at), w, right)
+
+    y -= 0.2 * cm
+    ensure_space()
 
     # Site
     c.setFont("Helvetica-Bold", 12)
-    c.drawString(x, y, "Site")
-    y -= 16
+    c.drawString(left, y, "Site")
+    y -= 0.8 * cm
 
-    y = _draw_kv(c, x, y, "URL", str(site.url), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Domain", str(site.domain), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Verified", str(bool(site.is_verified)), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Verified At", _fmt_dt(site.verified_at), W - 2 * margin)
-    y -= 10
+    y = _draw_kv(c, left, y, "URL", site.url, w, right)
+    y = _draw_kv(c, left, y, "Domain", site.domain, w, right)
+    y = _draw_kv(c, left, y, "Verified", str(bool(site.is_verified)), w, right)
+    y = _draw_kv(c, left, y, "Verified At", _fmt(site.verified_at), w, right)
 
-    summary = _safe(scan.summary, {}) or {}
+    y -= 0.2 * cm
+    ensure_space()
 
-    # Headers
+    # Security Headers
     c.setFont("Helvetica-Bold", 12)
-    c.drawString(x, y, "Headers")
-    y -= 16
-
-    headers = (summary.get("headers") or {})
-    sec = (headers.get("security_headers") or {})
-    y = _draw_kv(c, x, y, "HTTP", str(headers.get("status_code")), W - 2 * margin)
+    c.drawString(left, y, "Security Headers")
+    y -= 0.8 * cm
     for k in [
         "strict-transport-security",
         "content-security-policy",
@@ -128,89 +119,123 @@ def build_scan_pdf(
         "referrer-policy",
         "permissions-policy",
     ]:
-        y = _draw_kv(c, x, y, k, str(sec.get(k) or "null"), W - 2 * margin)
+        ensure_space()
+        y = _draw_kv(c, left, y, k, (sec_headers or {}).get(k) or "-", w, right)
 
-    if y < 120:
-        new_page()
+    y -= 0.2 * cm
+    ensure_space()
 
     # TLS
     c.setFont("Helvetica-Bold", 12)
-    c.drawString(x, y, "TLS")
-    y -= 16
+    c.drawString(left, y, "TLS")
+    y -= 0.8 * cm
+    for k in ["enabled", "protocol", "cipher", "notBefore", "notAfter"]:
+        ensure_space()
+        y = _draw_kv(c, left, y, k, tls.get(k) if tls.get(k) is not None else "-", w, right)
 
-    tls = (summary.get("tls") or {})
-    y = _draw_kv(c, x, y, "Enabled", str(tls.get("enabled")), W - 2 * margin)
-    if tls.get("enabled"):
-        y = _draw_kv(c, x, y, "Protocol", str(tls.get("protocol")), W - 2 * margin)
-        y = _draw_kv(c, x, y, "Cipher", str(tls.get("cipher")), W - 2 * margin)
-        y = _draw_kv(c, x, y, "NotBefore", str(tls.get("notBefore")), W - 2 * margin)
-        y = _draw_kv(c, x, y, "NotAfter", str(tls.get("notAfter")), W - 2 * margin)
-
-    if y < 120:
-        new_page()
+    y -= 0.2 * cm
+    ensure_space()
 
     # Crawl
     c.setFont("Helvetica-Bold", 12)
-    c.drawString(x, y, "Crawl Metrics")
-    y -= 16
-
-    crawl = (summary.get("crawl") or {})
-    y = _draw_kv(c, x, y, "Visited", str(crawl.get("visited")), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Unique Seen", str(crawl.get("unique_seen")), W - 2 * margin)
-    y = _draw_kv(c, x, y, "Time (sec)", str(crawl.get("time_spent_sec")), W - 2 * margin)
-
-    # Findings (advanced)
-    findings = summary.get("findings") or []
-    if findings:
-        if y < 160:
-            new_page()
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(x, y, "Findings")
-        y -= 16
+    c.drawString(left, y, "Crawl")
+    y -= 0.8 * cm
+    for k in ["visited", "unique_seen", "time_spent_sec"]:
+        ensure_space()
+        y = _draw_kv(c, left, y, k, crawl.get(k) if crawl.get(k) is not None else "-", w, right)
+
+    y -= 0.2 * cm
+    ensure_space()
 
+    # Risk Score (optional)
+    risk = data.risk
+    score = risk.get("score", 0)
+    label = risk.get("label", "-")
+    counts = risk.get("counts") or {}
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(left, y, "Risk Score")
+    y -= 0.8 * cm
+
+    y = _draw_kv(c, left, y, "Score (0-100)", score, w, right)
+    y = _draw_kv(c, left, y, "Level", label, w, right)
+    cnt_line = " / ".join([f"{k}:{counts.get(k,0)}" for k in ["critical", "high", "medium", "low", "info"]])
+    y = _draw_kv(c, left, y, "Counts", cnt_line, w, right)
+
+    y -= 0.2 * cm
+    ensure_space()
+
+    # Findings (sorted)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(left, y, "Findings (sorted)")
+    y -= 0.8 * cm
+
+    findings_sorted = data.findings
+
+    if not findings_sorted:
         c.setFont("Helvetica", 10)
-        for f in findings:
-            line = f"- [{f.get('severity')}] {f.get('title')} ({f.get('id')})"
-            c.drawString(x, y, line)
-            y -= 14
-            ev = str(f.get("evidence") or "")
-            if ev:
-                c.drawString(x + 14, y, ev[:120])
-                y -= 14
-            if y < 80:
-                new_page()
-                c.setFont("Helvetica", 10)
-
-    # Pages appendix (اختياري)
-    if pages:
-        new_page()
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(x, y, "Pages")
-        y -= 16
-
-        c.setFont("Helvetica", 9)
-        for p in pages:
-            url = str(p.get("url") or "")
-            sc = str(p.get("status_code") or "")
-            dt = str(p.get("created_at") or "")
-            line = f"{sc:>3}  {dt}  {url}"
-            # truncate
-            if len(line) > 140:
-                line = line[:137] + "..."
-            c.drawString(x, y, line)
-            y -= 12
-            if y < 60:
-                new_page()
-                c.setFont("Helvetica", 9)
-
-    # Error if failed
-    if scan.status == "failed" and scan.error:
-        new_page()
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(x, y, "Error")
-        y -= 16
+        c.drawString(left, y, "- none -")
+        y -= 0.6 * cm
+    else:
+        c.setFont("Helvetica", 10)
+        for f in findings_sorted:
+            ensure_space()
+            sev = (f.get("severity") or "info").lower()
+            line = f"- [{sev}] {f.get('title')} ({f.get('id')})"
+            c.drawString(left, y, line)
+            y -= 0.55 * cm
+
+            ev = f.get("evidence") or "-"
+            for ln in _wrap_text(c, f"evidence: {ev}", max_width=(w - right - left), font="Helvetica", size=10):
+                ensure_space()
+                c.drawString(left + 0.3 * cm, y, ln)
+                y -= 0.55 * cm
+
+            y -= 0.2 * cm
+
+    # ✅ Top Fixes (short)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(left, y, "Top Fixes")
+    y -= 0.8 * cm
+
+    fixes = data.fixes
+
+    c.setFont("Helvetica", 10)
+    if not fixes:
+        c.drawString(left, y, "- none -")
+        y -= 0.6 * cm
+    else:
+        for fx in fixes:
+            ensure_space()
+            for ln in _wrap_text(c, f"- {fx}", max_width=(w - right - left), font="Helvetica", size=10):
+                ensure_space()
+                c.drawString(left, y, ln)
+                y -= 0.55 * cm
+            y -= 0.1 * cm
+
+    y -= 0.2 * cm
+    ensure_space()
+
+    # Paid appendix: pages
+    if include_pages:
+        c.showPage()
+        y = h - 2 * cm
+
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(left, y, "Appendix: Pages")
+        y -= 1.0 * cm
+
         c.setFont("Helvetica", 10)
-        c.drawString(x, y, str(scan.error)[:4000])
+        empty = True
+        for p in pages:
+            empty = False
+            ensure_space()
+            line = f"{p.status_code or '-'}  {p.url}"
+            for ln in _wrap_text(c, line, max_width=(w - right - left), font="Helvetica", size=10):
+                ensure_space()
+                c.drawString(left, y, ln)
+                y -= 0.5 * cm
+        if empty:
+            c.drawString(left, y, "- none -")
 
     c.save()
-    return buf.getvalue()
\ No newline at end of file
@@ -0,0 +1,229 @@
+# backend/app/reports/pipeline.py
+
+"""
+One report pipeline for every report route:
+  load_report_data()  -> scan + site + owner + plan in a single joined query
+  render_report()     -> cache lookup, else one registered backend writes the artifact
+
+Backends are writer(out, data, pages) functions keyed by format, so new output
+formats plug in next to the PDF one without touching the routes' data loading.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterable
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.scans.models import Scan
+from app.sites.models import Site
+from app.users.models import User
+from app.plans.models import Plan
+from app.scans.pages_models import ScanPage
+from app.reports import cache as report_cache
+from app.reports.prerender import is_pending
+from app.reports.pdf import write_pdf
+from app.reports.formats import write_json, write_html, write_csv
+
+PAGES_CHUNK_ROWS = 500  # appendix rows fetched per DB round trip
+
+SEV_RANK = {"critical": 4, "high": 3, "medium": 2, "low": 1, "info": 0}
+
+FIX_BY_FINDING = {
+    "missing_csp": "Add a strong Content-Security-Policy (CSP) header.",
+    "missing_xfo": "Add X-Frame-Options (or CSP frame-ancestors) to prevent clickjacking.",
+    "missing_hsts": "Enable HSTS (Strict-Transport-Security) to force HTTPS.",
+    "missing_xcto": "Add X-Content-Type-Options: nosniff.",
+    "missing_referrer_policy": "Add Referrer-Policy (e.g., strict-origin-when-cross-origin).",
+    "missing_permissions_policy": "Add Permissions-Policy to restrict powerful browser features.",
+}
+
+
+def _sev_rank(sev: str | None) -> int:
+    s = (sev or "").strip().lower()
+    return SEV_RANK.get(s, 0)
+
+
+def sorted_findings(findings: list[dict]) -> list[dict]:
+    return sorted(
+        findings or [],
+        key=lambda f: (
+            -_sev_rank((f or {}).get("severity")),
+            str((f or {}).get("id") or ""),
+            str((f or {}).get("title") or ""),
+        ),
+    )
+
+
+def top_fixes(sec_headers: dict, findings_sorted: list[dict], limit: int = 3) -> list[str]:
+    """
+    Generate short actionable fixes (Top N) from findings + missing security headers.
+    Uses findings severity ordering already applied in findings_sorted.
+    """
+    fixes: list[str] = []
+
+    # A) map known finding IDs
+    for f in findings_sorted or []:
+        fid = (f or {}).get("id")
+        if fid in FIX_BY_FINDING:
+            fixes.append(FIX_BY_FINDING[fid])
+
+    # B) fallback from missing headers
+    sec_headers = sec_headers or {}
+    if not sec_headers.get("content-security-policy"):
+        fixes.append(FIX_BY_FINDING["missing_csp"])
+    if not sec_headers.get("x-frame-options"):
+        fixes.append(FIX_BY_FINDING["missing_xfo"])
+    if not sec_headers.get("x-content-type-options"):
+        fixes.append(FIX_BY_FINDING["missing_xcto"])
+    if not sec_headers.get("referrer-policy"):
+        fixes.append(FIX_BY_FINDING["missing_referrer_policy"])
+    if not sec_headers.get("permissions-policy"):
+        fixes.append(FIX_BY_FINDING["missing_permissions_policy"])
+
+    # unique while preserving order
+    uniq: list[str] = []
+    for x in fixes:
+        if x not in uniq:
+            uniq.append(x)
+
+    return uniq[: max(0, int(limit))]
+
+
+@dataclass
+class ReportData:
+    scan: Scan
+    site: Site
+    user: User
+    plan: Plan
+
+    @property
+    def include_pages(self) -> bool:
+        return bool(self.plan.allow_history)  # paid only
+
+    @property
+    def summary(self) -> dict:
+        return self.scan.summary or {}
+
+    @property
+    def sec_headers(self) -> dict:
+        return (self.summary.get("headers") or {}).get("security_headers") or {}
+
+    @property
+    def tls(self) -> dict:
+        return self.summary.get("tls") or {}
+
+    @property
+    def crawl(self) -> dict:
+        return self.summary.get("crawl") or {}
+
+    @property
+    def risk(self) -> dict:
+        return self.summary.get("risk") or {}
+
+    @property
+    def findings(self) -> list[dict]:
+        return sorted_findings(self.summary.get("findings") or [])
+
+    @property
+    def fixes(self) -> list[str]:
+        return top_fixes(self.sec_headers, self.findings, limit=3)
+
+    def key(self, fmt: str = "pdf") -> str:
+        return report_cache.report_key(
+            self.scan, self.site, include_pages=self.include_pages, plan_name=self.plan.name, fmt=fmt
+        )
+
+
+def _report_query(db: Session, user_id: int):
+    return (
+        db.query(Scan, Site, User, Plan)
+        .outerjoin(Site, (Site.id == Scan.site_id) & (Site.user_id == Scan.user_id))
+        .outerjoin(User, User.id == Scan.user_id)
+        .outerjoin(Plan, Plan.id == User.plan_id)
+        .filter(Scan.user_id == user_id)
+    )
+
+
+def _report_data(row) -> ReportData:
+    scan, site, user, plan = row
+    if not site:
+        raise HTTPException(status_code=404, detail="Site not found")
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not plan:
+        raise HTTPException(status_code=500, detail="Plan missing")
+    return ReportData(scan=scan, site=site, user=user, plan=plan)
+
+
+def load_report_data(db: Session, *, scan_id: int, user_id: int) -> ReportData:
+    row = _report_query(db, user_id).filter(Scan.id == scan_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    return _report_data(row)
+
+
+def load_report_data_many(db: Session, *, scan_ids: list[int], user_id: int) -> list[ReportData]:
+    """
+    Bundle variant: one joined query for all scans, returned in scan_ids order.
+    """
+    rows = _report_query(db, user_id).filter(Scan.id.in_(scan_ids)).all()
+    by_id = {row[0].id: row for row in rows}
+    missing = [sid for sid in scan_ids if sid not in by_id]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Scan not found: {missing}")
+    return [_report_data(by_id[sid]) for sid in scan_ids]
+
+
+def iter_pages(db: Session, scan_id: int) -> Iterable:
+    # lazy: rows arrive PAGES_CHUNK_ROWS at a time from a server-side cursor
+    return (
+        db.query(ScanPage.id, ScanPage.url, ScanPage.status_code, ScanPage.created_at)
+        .filter(ScanPage.scan_id == scan_id)
+        .order_by(ScanPage.id.asc())
+        .execution_options(yield_per=PAGES_CHUNK_ROWS)
+    )
+
+
+Writer = Callable[[BinaryIO, ReportData, Iterable], None]
+
+# fmt -> (writer, media type)
+RENDERERS: dict[str, tuple[Writer, str]] = {}
+
+
+def register_renderer(fmt: str, writer: Writer, media_type: str):
+    RENDERERS[fmt] = (writer, media_type)
+
+
+def media_type(fmt: str) -> str:
+    return RENDERERS[fmt][1]
+
+
+def render_report(db: Session, data: ReportData, *, fmt: str = "pdf", wait_prerender: bool = False) -> BinaryIO | None:
+    """
+    Cached render: a finished scan's report is built once, then served from disk.
+    Pages are only queried on a cache miss.
+    Returns the artifact as an open file (caller closes it), or None while a
+    background PDF pre-render is running (-> 202), unless wait_prerender.
+    """
+    scan_id = data.scan.id
+    key = data.key(fmt)
+
+    f = report_cache.open_cached(scan_id, key, fmt)
+    if f is not None:
+        return f
+
+    if fmt == "pdf" and not wait_prerender and is_pending(scan_id):
+        return None
+
+    writer, _media_type = RENDERERS[fmt]
+    pages = iter_pages(db, scan_id) if data.include_pages else ()
+    return report_cache.put_file(scan_id, key, lambda out: writer(out, data, pages), fmt)
+
+
+register_renderer("pdf", write_pdf, "application/pdf")
+register_renderer("json", write_json, "application/json")
+register_renderer("html", write_html, "text/html; charset=utf-8")
+register_renderer("csv", write_csv, "text/csv; charset=utf-8")
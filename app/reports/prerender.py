@@ -0,0 +1,108 @@
+# backend/app/reports/prerender.py
+
+"""
+Render PDF reports off the request path.
+
+When the worker marks a scan done it calls submit_prerender(scan_id); a process
+pool renders the report into the report cache. Report routes serve the stored
+artifact, answer 202 while it is still rendering, and only render inline for
+scans that were never pre-rendered (older scans, pool disabled, other node).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from app.core.config import REPORT_RENDER_PROCESSES
+
+_pool: ProcessPoolExecutor | None = None
+_pending: dict[int, Future] = {}
+_lock = threading.Lock()
+
+
+def render_scan_report(scan_id: int, fmt: str = "pdf") -> bool:
+    """
+    Runs in a pool process: load scan + owner's plan, render into the cache.
+    """
+    # imported here: the child process builds its own engine/session on spawn
+    from fastapi import HTTPException
+    from app.db.session import SessionLocal
+    from app.scans.models import Scan
+    from app.reports.pipeline import load_report_data, render_report
+
+    db = SessionLocal()
+    try:
+        owner = db.query(Scan.user_id, Scan.status).filter(Scan.id == scan_id).first()
+        if not owner or owner.status not in ("done", "failed"):
+            return False
+        try:
+            data = load_report_data(db, scan_id=scan_id, user_id=owner.user_id)
+        except HTTPException:
+            return False
+
+        render_report(db, data, fmt=fmt, wait_prerender=True).close()
+        return True
+    finally:
+        db.close()
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    if REPORT_RENDER_PROCESSES <= 0:
+        return None
+    with _lock:
+        if _pool is None:
+            # spawn: never fork a process holding open DB connections / threads
+            _pool = ProcessPoolExecutor(
+                max_workers=REPORT_RENDER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _done(scan_id: int, fut: Future):
+    with _lock:
+        if _pending.get(scan_id) is fut:
+            _pending.pop(scan_id, None)
+    if not fut.cancelled() and fut.exception():
+        print(f"[prerender] scan {scan_id} failed: {fut.exception()!r}")
+
+
+def submit_prerender(scan_id: int, fmt: str = "pdf") -> Future | None:
+    """
+    Queue a render; returns the Future (None if the pool is disabled/shut down).
+    A PDF render already in flight for this scan is reused, not duplicated.
+    """
+    pool = _get_pool()
+    if not pool:
+        return None
+    if fmt == "pdf":
+        with _lock:
+            fut = _pending.get(scan_id)
+        if fut and not fut.done():
+            return fut
+    try:
+        fut = pool.submit(render_scan_report, scan_id, fmt)
+    except RuntimeError:
+        return None  # pool shut down
+    if fmt == "pdf":
+        with _lock:
+            _pending[scan_id] = fut
+        fut.add_done_callback(lambda f: _done(scan_id, f))
+    return fut
+
+
+def is_pending(scan_id: int) -> bool:
+    with _lock:
+        fut = _pending.get(scan_id)
+    return bool(fut and not fut.done())
+
+
+def shutdown_prerender():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,26 +1,25 @@
 # backend/app/reports/routes.py
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, insert
 from datetime import datetime, timezone, timedelta
 import secrets
 import os
-
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
+from typing import BinaryIO, Literal
 
 from app.db.session import get_db
 from app.auth.deps import get_current_user
 from app.users.models import User
 from app.scans.models import Scan
-from app.sites.models import Site
-from app.scans.pages_models import ScanPage
 from app.plans.limits import get_user_plan
+from app.plans.quotas import enforce_report_quota
 
 from app.reports.models import ReportEvent, ReportShareLink
+from app.reports.pipeline import ReportData, load_report_data, load_report_data_many, render_report, media_type
+from app.reports.bundle import render_bundle, arcname, iter_zip
 from app.email.resend_client import send_email, EmailSendError
 
 # ✅ Rate limiting (slowapi)
@@ -28,6 +27,15 @@ from app.core.ratelimit import limiter
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+FILE_CHUNK_BYTES = 64 * 1024
+MAX_BUNDLE_SCANS = 50
+
+
+class BundleBody(BaseModel):
+    scan_ids: list[int] | None = Field(default=None, max_length=MAX_BUNDLE_SCANS)
+    latest_per_site: bool = False
+    format: Literal["pdf", "json", "html", "csv"] = "pdf"
+
 
 # ---------------- helpers ----------------
 
@@ -39,68 +47,6 @@ def _as_utc(dt):
     return dt
 
 
-def _fmt(dt):
-    dt = _as_utc(dt)
-    if not dt:
-        return "-"
-    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
-
-
-def _wrap_text(c: canvas.Canvas, text: str, max_width: float, font="Helvetica", size=10):
-    c.setFont(font, size)
-    s = str(text or "-")
-    words = s.split()
-    if not words:
-        return ["-"]
-
-    lines = []
-    line = ""
-
-    def push_line(x):
-        if x:
-            lines.append(x)
-
-    for w in words:
-        t = (line + " " + w).strip()
-        if c.stringWidth(t, font, size) <= max_width:
-            line = t
-        else:
-            if not line:
-                chunk = ""
-                for ch in w:
-                    if c.stringWidth(chunk + ch, font, size) <= max_width:
-                        chunk += ch
-                    else:
-                        push_line(chunk)
-                        chunk = ch
-                push_line(chunk)
-                line = ""
-            else:
-                push_line(line)
-                line = w
-
-    push_line(line)
-    return lines or ["-"]
-
-
-def _draw_kv(c: canvas.Canvas, x, y, k, v, page_width, right_margin):
-    key_w = 110
-    max_val_w = (page_width - right_margin) - (x + key_w)
-
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(x, y, f"{k}:")
-
-    c.setFont("Helvetica", 10)
-    lines = _wrap_text(c, "-" if v is None else v, max_val_w, font="Helvetica", size=10)
-
-    yy = y
-    for ln in lines:
-        c.drawString(x + key_w, yy, ln)
-        yy -= 0.5 * cm
-
-    return yy
-
-
 def _require_finished(scan: Scan):
     if scan.status not in ("done", "failed"):
         raise HTTPException(status_code=409, detail="Scan is not finished yet")
@@ -124,328 +70,122 @@ def _enforce_history_policy(db: Session, user: User, plan, scan: Scan):
         )
 
 
-def _enforce_report_quota(db: Session, user: User, plan, *, kind: str):
-    """
-    Free: 3 PDFs / 24h
-    Paid: 200 PDFs / 24h
-    Paid email: 50 / 24h (kind="pdf_email")
-    """
-    now = datetime.now(timezone.utc)
-    window_start = now - timedelta(hours=24)
-
-    used = (
-        db.query(ReportEvent)
-        .filter(ReportEvent.user_id == user.id)
-        .filter(ReportEvent.kind == kind)
-        .filter(ReportEvent.created_at >= window_start)
-        .count()
-    )
-
-    if kind == "pdf_email":
-        limit = 0 if plan.name == "free" else 50
-    else:
-        limit = 3 if plan.name == "free" else 200
-
-    if used >= limit:
-        raise HTTPException(
-            status_code=429,
-            detail=f"Report limit reached: {limit} per 24h on your plan",
-        )
-
-
 def _log_report_event(db: Session, user_id: int, scan_id: int | None, kind: str):
     db.add(ReportEvent(user_id=user_id, scan_id=scan_id, kind=kind))
     db.commit()
 
 
-def _sev_rank(sev: str | None) -> int:
-    s = (sev or "").strip().lower()
-    return {"critical": 4, "high": 3, "medium": 2, "low": 1, "info": 0}.get(s, 0)
-
-
-def _sorted_findings(findings: list[dict]) -> list[dict]:
-    return sorted(
-        findings or [],
-        key=lambda f: (
-            -_sev_rank((f or {}).get("severity")),
-            str((f or {}).get("id") or ""),
-            str((f or {}).get("title") or ""),
-        ),
-    )
-
-
-def _top_fixes(sec_headers: dict, findings_sorted: list[dict], limit: int = 3) -> list[str]:
-    """
-    Generate short actionable fixes (Top N) from findings + missing security headers.
-    Uses findings severity ordering already applied in findings_sorted.
-    """
-    fixes: list[str] = []
-
-    id_to_fix = {
-        "missing_csp": "Add a strong Content-Security-Policy (CSP) header.",
-        "missing_xfo": "Add X-Frame-Options (or CSP frame-ancestors) to prevent clickjacking.",
-        "missing_hsts": "Enable HSTS (Strict-Transport-Security) to force HTTPS.",
-        "missing_xcto": "Add X-Content-Type-Options: nosniff.",
-        "missing_referrer_policy": "Add Referrer-Policy (e.g., strict-origin-when-cross-origin).",
-        "missing_permissions_policy": "Add Permissions-Policy to restrict powerful browser features.",
-    }
-
-    # A) map known finding IDs
-    for f in findings_sorted or []:
-        fid = (f or {}).get("id")
-        if fid in id_to_fix:
-            fixes.append(id_to_fix[fid])
-
-    # B) fallback from missing headers
-    sec_headers = sec_headers or {}
-    if not sec_headers.get("content-security-policy"):
-        fixes.append("Add a strong Content-Security-Policy (CSP) header.")
-    if not sec_headers.get("x-frame-options"):
-        fixes.append("Add X-Frame-Options (or CSP frame-ancestors) to prevent clickjacking.")
-    if not sec_headers.get("x-content-type-options"):
-        fixes.append("Add X-Content-Type-Options: nosniff.")
-    if not sec_headers.get("referrer-policy"):
-        fixes.append("Add Referrer-Policy (e.g., strict-origin-when-cross-origin).")
-    if not sec_headers.get("permissions-policy"):
-        fixes.append("Add Permissions-Policy to restrict powerful browser features.")
-
-    # unique while preserving order
-    uniq: list[str] = []
-    for x in fixes:
-        if x not in uniq:
-            uniq.append(x)
-
-    return uniq[: max(0, int(limit))]
-
-
-def _build_pdf_bytes(
-    *,
-    plan_name: str,
-    scan: Scan,
-    site: Site,
-    sec_headers: dict,
-    tls: dict,
-    crawl: dict,
-    findings: list,
-    pages: list[ScanPage],
-    include_pages: bool,
-) -> bytes:
-    import io
-
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
-    w, h = A4
-
-    left = 2 * cm
-    right = 2 * cm
-    y = h - 2 * cm
-
-    def ensure_space(min_y=2.5 * cm):
-        nonlocal y
-        if y < min_y:
-            c.showPage()
-            y = h - 2 * cm
-
-    # Title
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(left, y, "SaaS Scanner Report")
-    y -= 1.2 * cm
-
-    # Meta
-    y = _draw_kv(c, left, y, "Plan", plan_name, w, right)
-    y = _draw_kv(c, left, y, "Scan ID", scan.id, w, right)
-    y = _draw_kv(c, left, y, "Type", scan.scan_type, w, right)
-    y = _draw_kv(c, left, y, "Status", scan.status, w, right)
-    y = _draw_kv(c, left, y, "Created", _fmt(scan.created_at), w, right)
-    y = _draw_kv(c, left, y, "Started", _fmt(scan.started_at), w, right)
-    y = _draw_kv(c, left, y, "Finished", _fmt(scan.finished_at), w, right)
-
-    y -= 0.2 * cm
-    ensure_space()
-
-    # Site
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(left, y, "Site")
-    y -= 0.8 * cm
-
-    y = _draw_kv(c, left, y, "URL", site.url, w, right)
-    y = _draw_kv(c, left, y, "Domain", site.domain, w, right)
-    y = _draw_kv(c, left, y, "Verified", str(bool(site.is_verified)), w, right)
-    y = _draw_kv(c, left, y, "Verified At", _fmt(site.verified_at), w, right)
-
-    y -= 0.2 * cm
-    ensure_space()
-
-    # Security Headers
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(left, y, "Security Headers")
-    y -= 0.8 * cm
-    for k in [
-        "strict-transport-security",
-        "content-security-policy",
-        "x-frame-options",
-        "x-content-type-options",
-        "referrer-policy",
-        "permissions-policy",
-    ]:
-        ensure_space()
-        y = _draw_kv(c, left, y, k, (sec_headers or {}).get(k) or "-", w, right)
-
-    y -= 0.2 * cm
-    ensure_space()
-
-    # TLS
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(left, y, "TLS")
-    y -= 0.8 * cm
-    for k in ["enabled", "protocol", "cipher", "notBefore", "notAfter"]:
-        ensure_space()
-        y = _draw_kv(c, left, y, k, tls.get(k) if tls.get(k) is not None else "-", w, right)
-
-    y -= 0.2 * cm
-    ensure_space()
-
-    # Crawl
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(left, y, "Crawl")
-    y -= 0.8 * cm
-    for k in ["visited", "unique_seen", "time_spent_sec"]:
-        ensure_space()
-        y = _draw_kv(c, left, y, k, crawl.get(k) if crawl.get(k) is not None else "-", w, right)
-
-    y -= 0.2 * cm
-    ensure_space()
-
-    # Risk Score (optional)
-    summary = scan.summary or {}
-    risk = summary.get("risk") or {}
-    score = risk.get("score", 0)
-    label = risk.get("label", "-")
-    counts = risk.get("counts") or {}
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(left, y, "Risk Score")
-    y -= 0.8 * cm
-
-    y = _draw_kv(c, left, y, "Score (0-100)", score, w, right)
-    y = _draw_kv(c, left, y, "Level", label, w, right)
-    cnt_line = " / ".join([f"{k}:{counts.get(k,0)}" for k in ["critical", "high", "medium", "low", "info"]])
-    y = _draw_kv(c, left, y, "Counts", cnt_line, w, right)
-
-    y -= 0.2 * cm
-    ensure_space()
-
-    # Findings (sorted)
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(left, y, "Findings (sorted)")
-    y -= 0.8 * cm
-
-    findings_sorted = _sorted_findings(findings or [])
-
-    if not findings_sorted:
-        c.setFont("Helvetica", 10)
-        c.drawString(left, y, "- none -")
-        y -= 0.6 * cm
-    else:
-        c.setFont("Helvetica", 10)
-        for f in findings_sorted:
-            ensure_space()
-            sev = (f.get("severity") or "info").lower()
-            line = f"- [{sev}] {f.get('title')} ({f.get('id')})"
-            c.drawString(left, y, line)
-            y -= 0.55 * cm
-
-            ev = f.get("evidence") or "-"
-            for ln in _wrap_text(c, f"evidence: {ev}", max_width=(w - right - left), font="Helvetica", size=10):
-                ensure_space()
-                c.drawString(left + 0.3 * cm, y, ln)
-                y -= 0.55 * cm
-
-            y -= 0.2 * cm
-
-    # ✅ Top Fixes (short)
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(left, y, "Top Fixes")
-    y -= 0.8 * cm
-
-    fixes = _top_fixes(sec_headers or {}, findings_sorted, limit=3)
-
-    c.setFont("Helvetica", 10)
-    if not fixes:
-        c.drawString(left, y, "- none -")
-        y -= 0.6 * cm
-    else:
-        for fx in fixes:
-            ensure_space()
-            for ln in _wrap_text(c, f"- {fx}", max_width=(w - right - left), font="Helvetica", size=10):
-                ensure_space()
-                c.drawString(left, y, ln)
-                y -= 0.55 * cm
-            y -= 0.1 * cm
-
-    y -= 0.2 * cm
-    ensure_space()
-
-    # Paid appendix: pages
-    if include_pages:
-        c.showPage()
-        y = h - 2 * cm
-
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(left, y, "Appendix: Pages")
-        y -= 1.0 * cm
-
-        c.setFont("Helvetica", 10)
-        if not pages:
-            c.drawString(left, y, "- none -")
-        else:
-            for p in pages:
-                ensure_space()
-                line = f"{p.status_code or '-'}  {p.url}"
-                for ln in _wrap_text(c, line, max_width=(w - right - left), font="Helvetica", size=10):
-                    ensure_space()
-                    c.drawString(left, y, ln)
-                    y -= 0.5 * cm
-
-    c.save()
-    pdf = buf.getvalue()
-    buf.close()
-    return pdf
-
-
-def _resolve_scan_for_pdf(
+def _resolve_scan_id(
     db: Session,
     user: User,
     scan_id: int | None,
     site_id: int | None,
     latest: bool,
-) -> Scan:
+) -> int:
+    # scan_id: ownership is checked by load_report_data's joined query
     if scan_id is not None:
-        scan = db.query(Scan).filter(Scan.id == scan_id, Scan.user_id == user.id).first()
-        if not scan:
-            raise HTTPException(status_code=404, detail="Scan not found")
-        return scan
+        return scan_id
 
     if site_id is not None:
-        q = db.query(Scan).filter(Scan.user_id == user.id, Scan.site_id == site_id)
+        q = db.query(Scan.id).filter(Scan.user_id == user.id, Scan.site_id == site_id)
         q = q.order_by(desc(Scan.id)) if latest else q.order_by(Scan.id.asc())
-        scan = q.first()
-        if not scan:
+        row = q.first()
+        if not row:
             raise HTTPException(status_code=404, detail="No scans found for this site")
-        return scan
+        return row.id
 
     raise HTTPException(status_code=400, detail="Provide scan_id or site_id")
 
 
-def _render_pdf_response(pdf: bytes, *, scan_id: int, as_attachment: bool):
+def _load_for_user(db: Session, user: User, scan_id, site_id, latest) -> ReportData:
+    sid = _resolve_scan_id(db, user, scan_id=scan_id, site_id=site_id, latest=latest)
+    return load_report_data(db, scan_id=sid, user_id=user.id)
+
+
+def _etag(key: str) -> str:
+    return f'"{key[:40]}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in inm.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _iter_file(f: BinaryIO):
+    try:
+        while True:
+            chunk = f.read(FILE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+
+def _file_response(f: BinaryIO, *, scan_id: int, fmt: str, as_attachment: bool, etag: str | None = None):
+    # f is already open (from the report cache), so eviction can't pull it away
     dispo = "attachment" if as_attachment else "inline"
-    return Response(
-        content=pdf,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'{dispo}; filename="scan-{scan_id}.pdf"'},
+    headers = {
+        "Content-Disposition": f'{dispo}; filename="scan-{scan_id}.{fmt}"',
+        "Content-Length": str(os.fstat(f.fileno()).st_size),
+    }
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "private, max-age=0, must-revalidate"
+    return StreamingResponse(_iter_file(f), media_type=media_type(fmt), headers=headers)
+
+
+def _not_modified_response(etag: str):
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def _pending_response(scan_id: int):
+    return JSONResponse(
+        status_code=202,
+        content={"detail": "Report is being rendered, retry shortly", "scan_id": scan_id},
+        headers={"Retry-After": "2"},
     )
 
 
+def _serve_report(
+    request: Request,
+    db: Session,
+    data: ReportData,
+    *,
+    fmt: str = "pdf",
+    as_attachment: bool = False,
+    event_kind: str | None = None,
+):
+    """
+    Shared tail of every report route: ETag/304 -> cached render (or 202) -> log -> stream.
+    """
+    etag = _etag(data.key(fmt))
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    f = render_report(db, data, fmt=fmt)
+    if f is None:
+        return _pending_response(data.scan.id)
+
+    try:
+        if event_kind:
+            _log_report_event(db, user_id=data.user.id, scan_id=data.scan.id, kind=event_kind)
+        return _file_response(f, scan_id=data.scan.id, fmt=fmt, as_attachment=as_attachment, etag=etag)
+    except Exception:
+        f.close()
+        raise
+
+
+def _latest_scan_ids_per_site(db: Session, user: User, *, finished_only: bool) -> dict[int, int]:
+    q = db.query(Scan.site_id, func.max(Scan.id)).filter(Scan.user_id == user.id)
+    if finished_only:
+        q = q.filter(Scan.status.in_(("done", "failed")))
+    return {site_id: scan_id for site_id, scan_id in q.group_by(Scan.site_id).all()}
+
+
 def _create_share_link(db: Session, *, user_id: int, scan_id: int, ttl_minutes: int = 15) -> str:
     token = secrets.token_urlsafe(32)
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=ttl_minutes)
@@ -458,106 +198,36 @@ def _create_share_link(db: Session, *, user_id: int, scan_id: int, ttl_minutes:
 
 @router.get("/pdf")
 def report_pdf(
+    request: Request,
     scan_id: int | None = Query(default=None),
     site_id: int | None = Query(default=None),
     latest: bool = Query(default=True),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    plan = get_user_plan(db, user)
-    _enforce_report_quota(db, user, plan, kind="pdf")
-
-    scan = _resolve_scan_for_pdf(db, user, scan_id=scan_id, site_id=site_id, latest=latest)
-    _require_finished(scan)
-    _enforce_history_policy(db, user, plan, scan)
-
-    site = db.query(Site).filter(Site.id == scan.site_id, Site.user_id == user.id).first()
-    if not site:
-        raise HTTPException(status_code=404, detail="Site not found")
-
-    summary = scan.summary or {}
-    headers = summary.get("headers") or {}
-    sec_headers = headers.get("security_headers") or {}
-    tls = summary.get("tls") or {}
-    crawl = summary.get("crawl") or {}
-    findings = summary.get("findings") or []
-
-    include_pages = bool(plan.allow_history)  # paid only
-    pages: list[ScanPage] = []
-    if include_pages:
-        pages = (
-            db.query(ScanPage)
-            .filter(ScanPage.scan_id == scan.id)
-            .order_by(ScanPage.id.asc())
-            .all()
-        )
+    data = _load_for_user(db, user, scan_id, site_id, latest)
+    enforce_report_quota(db, user.id, data.plan, kind="pdf")
+    _require_finished(data.scan)
+    _enforce_history_policy(db, user, data.plan, data.scan)
 
-    pdf = _build_pdf_bytes(
-        plan_name=plan.name,
-        scan=scan,
-        site=site,
-        sec_headers=sec_headers,
-        tls=tls,
-        crawl=crawl,
-        findings=findings,
-        pages=pages,
-        include_pages=include_pages,
-    )
-
-    _log_report_event(db, user_id=user.id, scan_id=scan.id, kind="pdf")
-    return _render_pdf_response(pdf, scan_id=scan.id, as_attachment=False)
+    return _serve_report(request, db, data, as_attachment=False, event_kind="pdf")
 
 
 @router.get("/pdf/download")
 def report_pdf_download(
+    request: Request,
     scan_id: int | None = Query(default=None),
     site_id: int | None = Query(default=None),
     latest: bool = Query(default=True),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    plan = get_user_plan(db, user)
-    _enforce_report_quota(db, user, plan, kind="pdf_download")
-
-    scan = _resolve_scan_for_pdf(db, user, scan_id=scan_id, site_id=site_id, latest=latest)
-    _require_finished(scan)
-    _enforce_history_policy(db, user, plan, scan)
+    data = _load_for_user(db, user, scan_id, site_id, latest)
+    enforce_report_quota(db, user.id, data.plan, kind="pdf_download")
+    _require_finished(data.scan)
+    _enforce_history_policy(db, user, data.plan, data.scan)
 
-    site = db.query(Site).filter(Site.id == scan.site_id, Site.user_id == user.id).first()
-    if not site:
-        raise HTTPException(status_code=404, detail="Site not found")
-
-    summary = scan.summary or {}
-    headers = summary.get("headers") or {}
-    sec_headers = headers.get("security_headers") or {}
-    tls = summary.get("tls") or {}
-    crawl = summary.get("crawl") or {}
-    findings = summary.get("findings") or []
-
-    include_pages = bool(plan.allow_history)  # paid only
-    pages: list[ScanPage] = []
-    if include_pages:
-        pages = (
-            db.query(ScanPage)
-            .filter(ScanPage.scan_id == scan.id)
-            .order_by(ScanPage.id.asc())
-            .all()
-        )
-
-    pdf = _build_pdf_bytes(
-        plan_name=plan.name,
-        scan=scan,
-        site=site,
-        sec_headers=sec_headers,
-        tls=tls,
-        crawl=crawl,
-        findings=findings,
-        pages=pages,
-        include_pages=include_pages,
-    )
-
-    _log_report_event(db, user_id=user.id, scan_id=scan.id, kind="pdf_download")
-    return _render_pdf_response(pdf, scan_id=scan.id, as_attachment=True)
+    return _serve_report(request, db, data, as_attachment=True, event_kind="pdf_download")
 
 
 @router.head("/pdf")
@@ -568,13 +238,95 @@ def report_pdf_head(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    plan = get_user_plan(db, user)
-    scan = _resolve_scan_for_pdf(db, user, scan_id=scan_id, site_id=site_id, latest=latest)
-    _require_finished(scan)
-    _enforce_history_policy(db, user, plan, scan)
+    data = _load_for_user(db, user, scan_id, site_id, latest)
+    _require_finished(data.scan)
+    _enforce_history_policy(db, user, data.plan, data.scan)
     return Response(status_code=200, headers={"Content-Type": "application/pdf"})
 
 
+# ✅ lightweight formats: same report data, no reportlab (CI / dashboards)
+@router.get("/{fmt}")
+def report_alt_format(
+    request: Request,
+    fmt: Literal["json", "html", "csv"],
+    scan_id: int | None = Query(default=None),
+    site_id: int | None = Query(default=None),
+    latest: bool = Query(default=True),
+    download: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    data = _load_for_user(db, user, scan_id, site_id, latest)
+    enforce_report_quota(db, user.id, data.plan, kind=fmt)
+    _require_finished(data.scan)
+    _enforce_history_policy(db, user, data.plan, data.scan)
+
+    return _serve_report(request, db, data, fmt=fmt, as_attachment=download, event_kind=fmt)
+
+
+# ✅ many reports in one ZIP (one quota check, one bulk event insert)
+@router.post("/bundle")
+def report_bundle(
+    body: BundleBody,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    fmt = body.format
+    plan = get_user_plan(db, user)
+
+    if body.scan_ids:
+        scan_ids = list(dict.fromkeys(body.scan_ids))
+    elif body.latest_per_site:
+        scan_ids = sorted(_latest_scan_ids_per_site(db, user, finished_only=True).values())
+    else:
+        raise HTTPException(status_code=400, detail="Provide scan_ids or latest_per_site=true")
+
+    if not scan_ids:
+        raise HTTPException(status_code=404, detail="No finished scans found")
+    if len(scan_ids) > MAX_BUNDLE_SCANS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BUNDLE_SCANS} scans per bundle")
+
+    # same quota bucket as the single-report endpoints: a bundle is N downloads
+    kind = "pdf_download" if fmt == "pdf" else fmt
+    enforce_report_quota(db, user.id, plan, kind=kind, count=len(scan_ids))
+
+    items = load_report_data_many(db, scan_ids=scan_ids, user_id=user.id)
+    unfinished = [d.scan.id for d in items if d.scan.status not in ("done", "failed")]
+    if unfinished:
+        raise HTTPException(status_code=409, detail=f"Scans not finished yet: {unfinished}")
+
+    # history policy, batched: Free may only export each site's latest scan
+    if not plan.allow_history:
+        latest = _latest_scan_ids_per_site(db, user, finished_only=False)
+        if any(latest.get(d.scan.site_id) != d.scan.id for d in items):
+            raise HTTPException(
+                status_code=403,
+                detail="History is not available on Free plan (only latest scan)",
+            )
+
+    # open handles: they stay valid even if cache eviction unlinks files meanwhile
+    files = render_bundle(db, items, fmt=fmt)
+    entries = [(arcname(d, fmt), f) for d, f in zip(items, files)]
+
+    try:
+        db.execute(
+            insert(ReportEvent),
+            [{"user_id": user.id, "scan_id": d.scan.id, "kind": kind} for d in items],
+        )
+        db.commit()
+    except Exception:
+        for f in files:
+            f.close()
+        raise
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    return StreamingResponse(
+        iter_zip(entries, compress=(fmt != "pdf")),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="reports-{stamp}.zip"'},
+    )
+
+
 # ✅ Paid-only: Email report (sends link)
 @router.post("/email")
 @limiter.limit("5/minute")  # ✅ rate limit per IP
@@ -591,9 +343,10 @@ def email_report(
     if plan.name == "free":
         raise HTTPException(status_code=403, detail="Email reports are available on Paid plan only")
 
-    _enforce_report_quota(db, user, plan, kind="pdf_email")
+    enforce_report_quota(db, user.id, plan, kind="pdf_email")
 
-    scan = _resolve_scan_for_pdf(db, user, scan_id=scan_id, site_id=site_id, latest=latest)
+    data = _load_for_user(db, user, scan_id, site_id, latest)
+    scan = data.scan
     _require_finished(scan)
     _enforce_history_policy(db, user, plan, scan)
 
@@ -644,64 +397,19 @@ def public_report_pdf(
     if not exp or exp <= now:
         raise HTTPException(status_code=410, detail="Link expired")
 
-    scan = db.query(Scan).filter(Scan.id == link.scan_id, Scan.user_id == link.user_id).first()
-    if not scan:
-        raise HTTPException(status_code=404, detail="Scan not found")
-
-    site = db.query(Site).filter(Site.id == scan.site_id, Site.user_id == link.user_id).first()
-    if not site:
-        raise HTTPException(status_code=404, detail="Site not found")
-
-    user = db.query(User).filter(User.id == link.user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    plan = get_user_plan(db, user)
-
-    summary = scan.summary or {}
-    headers = summary.get("headers") or {}
-    sec_headers = headers.get("security_headers") or {}
-    tls = summary.get("tls") or {}
-    crawl = summary.get("crawl") or {}
-    findings = summary.get("findings") or []
-
-    include_pages = bool(plan.allow_history)
-    pages: list[ScanPage] = []
-    if include_pages:
-        pages = (
-            db.query(ScanPage)
-            .filter(ScanPage.scan_id == scan.id)
-            .order_by(ScanPage.id.asc())
-            .all()
-        )
-
-    pdf = _build_pdf_bytes(
-        plan_name=plan.name,
-        scan=scan,
-        site=site,
-        sec_headers=sec_headers,
-        tls=tls,
-        crawl=crawl,
-        findings=findings,
-        pages=pages,
-        include_pages=include_pages,
-    )
-
-    return Response(
-        content=pdf,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'inline; filename="scan-{scan.id}.pdf"'},
-    )
+    data = load_report_data(db, scan_id=link.scan_id, user_id=link.user_id)
+    return _serve_report(request, db, data)
 
 
 # legacy
 @router.get("/scans/{scan_id}.pdf")
 def scan_report_pdf_legacy(
     scan_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    return report_pdf(scan_id=scan_id, site_id=None, latest=True, db=db, user=user)
+    return report_pdf(request=request, scan_id=scan_id, site_id=None, latest=True, db=db, user=user)
 
 
 @router.head("/scans/{scan_id}.pdf")
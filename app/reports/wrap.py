@@ -0,0 +1,76 @@
+# backend/app/reports/wrap.py
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+@lru_cache(maxsize=64)
+def _glyph_widths(font: str, size: float) -> dict[str, float]:
+    # filled lazily, one stringWidth() call per distinct character per font/size
+    return {}
+
+
+def text_width(s: str, font: str = "Helvetica", size: float = 10) -> float:
+    """
+    Same result as canvas.stringWidth (reportlab widths are per-glyph, no kerning),
+    but each glyph is measured once per font/size.
+    """
+    table = _glyph_widths(font, size)
+    total = 0.0
+    for ch in s:
+        w = table.get(ch)
+        if w is None:
+            w = table[ch] = stringWidth(ch, font, size)
+        total += w
+    return total
+
+
+def wrap_text(text, max_width: float, font: str = "Helvetica", size: float = 10) -> list[str]:
+    """
+    Greedy word wrap in linear time: every word and every character is measured
+    once. Words wider than max_width are split by character.
+    """
+    words = str(text or "-").split()
+    if not words:
+        return ["-"]
+
+    table = _glyph_widths(font, size)
+    space = text_width(" ", font, size)
+
+    lines: list[str] = []
+    line: list[str] = []
+    line_w = 0.0
+
+    for word in words:
+        ww = text_width(word, font, size)
+
+        if line and line_w + space + ww <= max_width:
+            line.append(word)
+            line_w += space + ww
+            continue
+
+        if line:
+            lines.append(" ".join(line))
+            line, line_w = [], 0.0
+
+        if ww <= max_width:
+            line, line_w = [word], ww
+            continue
+
+        # too wide for a line of its own: split by character
+        chunk_start = 0
+        chunk_w = 0.0
+        for i, ch in enumerate(word):
+            cw = table[ch]  # measured by text_width(word) above
+            if chunk_w + cw > max_width and i > chunk_start:
+                lines.append(word[chunk_start:i])
+                chunk_start, chunk_w = i, 0.0
+            chunk_w += cw
+        line, line_w = [word[chunk_start:]], chunk_w
+
+    if line:
+        lines.append(" ".join(line))
+    return lines or ["-"]
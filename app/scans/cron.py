@@ -0,0 +1,132 @@
+# backend/app/scans/cron.py
+
+"""
+Minimal 5-field cron (UTC): "minute hour day-of-month month day-of-week".
+
+Each field: *, N, A-B, lists "A,B", steps "*/N" or "A-B/N". Day-of-week 0-6
+(0 or 7 = Sunday). Like classic cron, if both day fields are restricted a day
+matches when either does. No names (MON, JAN) or @macros.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# (min, max) per field
+_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+# the next run is searched at most this far ahead (covers Feb 29 schedules)
+_MAX_DAYS = 366 * 5
+
+
+@dataclass(frozen=True)
+class CronSpec:
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]  # 0 = Sunday
+    days_any: bool
+    weekdays_any: bool
+
+
+def _parse_field(field: str, lo: int, hi: int) -> set[int]:
+    out: set[int] = set()
+    for part in field.split(","):
+        if not part:
+            raise ValueError(f"Empty cron field item in {field!r}")
+        rng, _, step_s = part.partition("/")
+        step = int(step_s) if step_s else 1
+        if step < 1:
+            raise ValueError(f"Invalid cron step in {part!r}")
+
+        if rng == "*":
+            a, b = lo, hi
+        elif "-" in rng:
+            a_s, b_s = rng.split("-", 1)
+            a, b = int(a_s), int(b_s)
+        else:
+            a = int(rng)
+            b = hi if step_s else a
+
+        if not (lo <= a <= hi and lo <= b <= hi and a <= b):
+            raise ValueError(f"Cron value out of range in {part!r} ({lo}-{hi})")
+        out.update(range(a, b + 1, step))
+    return out
+
+
+def parse_cron(expr: str) -> CronSpec:
+    fields = (expr or "").split()
+    if len(fields) != 5:
+        raise ValueError("Cron expression must have 5 fields: minute hour day month weekday")
+
+    try:
+        minutes, hours, days, months, weekdays = (
+            _parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, _RANGES)
+        )
+    except ValueError as e:
+        # int() errors included
+        raise ValueError(f"Invalid cron expression {expr!r}: {e}")
+
+    if 7 in weekdays:
+        weekdays = (weekdays - {7}) | {0}
+
+    return CronSpec(
+        minutes=tuple(sorted(minutes)),
+        hours=tuple(sorted(hours)),
+        days=frozenset(days),
+        months=frozenset(months),
+        weekdays=frozenset(weekdays),
+        days_any=fields[2] == "*",
+        weekdays_any=fields[4] == "*",
+    )
+
+
+def _day_matches(spec: CronSpec, d) -> bool:
+    if d.month not in spec.months:
+        return False
+    dom = d.day in spec.days
+    dow = (d.isoweekday() % 7) in spec.weekdays  # isoweekday: Mon=1..Sun=7
+    if spec.days_any and spec.weekdays_any:
+        return True
+    if spec.days_any:
+        return dow
+    if spec.weekdays_any:
+        return dom
+    return dom or dow
+
+
+def next_run(spec: CronSpec, after: datetime) -> datetime:
+    """
+    First matching minute strictly after `after` (tz preserved, seconds dropped).
+    Walks day by day, then only the listed hours/minutes: no minute-by-minute scan.
+    """
+    start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for offset in range(_MAX_DAYS):
+        day = start + timedelta(days=offset) if offset else start
+        if offset:
+            day = day.replace(hour=0, minute=0)
+        if not _day_matches(spec, day):
+            continue
+        for h in spec.hours:
+            if h < day.hour:
+                continue
+            for m in spec.minutes:
+                if h == day.hour and m < day.minute:
+                    continue
+                return day.replace(hour=h, minute=m)
+    raise ValueError("Cron expression never fires")
+
+
+def min_gap_minutes(spec: CronSpec) -> int:
+    """
+    Shortest gap between two consecutive runs, in minutes.
+    Every matching day fires at the same hours x minutes, so the gaps are the
+    ones within a day plus the wrap into the next day (counted even when the
+    day fields never match two days in a row: a safe upper bound on frequency).
+    """
+    times = sorted(h * 60 + m for h in spec.hours for m in spec.minutes)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    gaps.append(times[0] + 24 * 60 - times[-1])
+    return min(gaps)
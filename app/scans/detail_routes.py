@@ -20,6 +20,7 @@ def get_scan(scan_id: int, db: Session = Depends(get_db), user: User = Depends(g
         "created_at": s.created_at,
         "started_at": s.started_at,
         "finished_at": s.finished_at,
+        "progress": {"pages_visited": s.pages_visited or 0, "pages_seen": s.pages_seen or 0},
         "summary": s.summary,
         "error": s.error,
     }
\ No newline at end of file
@@ -0,0 +1,46 @@
+# backend/app/scans/events.py
+
+"""
+In-process "scan changed" signal for live progress streams.
+
+The worker calls notify_scan_changed(scan_id) from its threads (claim, page
+batch flush, done/failed). Each open stream owns an asyncio.Event that gets set
+on its own loop; the stream then reads the new state from the DB, so bursts
+coalesce into one read and nothing is pushed twice. Streams also re-read on a
+slow timer, which covers workers running on another node.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import contextmanager
+
+_subs: dict[int, set[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+_lock = threading.Lock()
+
+
+@contextmanager
+def subscribe(scan_id: int):
+    entry = (asyncio.get_running_loop(), asyncio.Event())
+    with _lock:
+        _subs.setdefault(scan_id, set()).add(entry)
+    try:
+        yield entry[1]
+    finally:
+        with _lock:
+            subs = _subs.get(scan_id)
+            if subs:
+                subs.discard(entry)
+                if not subs:
+                    _subs.pop(scan_id, None)
+
+
+def notify_scan_changed(scan_id: int):
+    with _lock:
+        targets = list(_subs.get(scan_id, ()))
+    for loop, event in targets:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # loop closed
@@ -0,0 +1,133 @@
+import asyncio
+import json
+from datetime import timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import get_db, SessionLocal
+from app.auth.deps import get_current_user
+from app.users.models import User
+from app.scans.models import Scan
+from app.scans.pages_models import ScanPage
+from app.scans.events import subscribe
+
+router = APIRouter(prefix="/scans", tags=["scans"])
+
+PAGES_PER_EVENT = 500
+FALLBACK_POLL_SECONDS = 15.0  # also the keep-alive ping interval
+
+
+def _iso(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def _snapshot(scan_id: int, after_id: int) -> tuple[dict | None, list[dict]]:
+    """
+    Light state (no summary JSON) + the next batch of pages after after_id.
+    """
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(
+                Scan.status,
+                Scan.pages_visited,
+                Scan.pages_seen,
+                Scan.started_at,
+                Scan.finished_at,
+                Scan.error,
+            )
+            .filter(Scan.id == scan_id)
+            .first()
+        )
+        if not row:
+            return None, []
+
+        pages = (
+            db.query(ScanPage.id, ScanPage.url, ScanPage.status_code)
+            .filter(ScanPage.scan_id == scan_id, ScanPage.id > after_id)
+            .order_by(ScanPage.id.asc())
+            .limit(PAGES_PER_EVENT)
+            .all()
+        )
+    finally:
+        db.close()
+
+    state = {
+        "status": row.status,
+        "pages_visited": row.pages_visited or 0,
+        "pages_seen": row.pages_seen or 0,
+        "started_at": _iso(row.started_at),
+        "finished_at": _iso(row.finished_at),
+        "error": row.error,
+    }
+    items = [{"id": p.id, "url": p.url, "status_code": p.status_code} for p in pages]
+    return state, items
+
+
+async def _scan_events(scan_id: int, after_id: int):
+    last_state = None
+    with subscribe(scan_id) as changed:
+        while True:
+            changed.clear()
+            state, pages = await run_in_threadpool(_snapshot, scan_id, after_id)
+            if state is None:
+                yield _sse("error", {"detail": "Scan not found"})
+                return
+
+            if state != last_state:
+                yield _sse("state", state)
+                last_state = state
+
+            if pages:
+                after_id = pages[-1]["id"]
+                yield _sse("pages", {"items": pages, "cursor": after_id})
+                if len(pages) == PAGES_PER_EVENT:
+                    continue  # more already stored, don't wait
+
+            # status is read before the pages and every page is stored before the
+            # scan turns done/failed, so a short batch here is the last one
+            if state["status"] in ("done", "failed"):
+                yield _sse("end", {"status": state["status"], "cursor": after_id})
+                return
+
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=FALLBACK_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+
+
+@router.get("/{scan_id}/events")
+def stream_scan_events(
+    scan_id: int,
+    after_id: int = Query(default=0, ge=0, description="Resume pages after this ScanPage.id"),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Server-sent events: `state` (status + progress counters), `pages`
+    (new ScanPage rows, in id order), `end` once the scan is done/failed.
+    """
+    s = db.query(Scan.id).filter(Scan.id == scan_id, Scan.user_id == user.id).first()
+    if not s:
+        raise HTTPException(status_code=404, detail="Scan not found")
+
+    # yield-dependencies are torn down only after the response ends: release the
+    # request session's connection now, the stream uses short-lived sessions
+    db.close()
+
+    return StreamingResponse(
+        _scan_events(scan_id, after_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
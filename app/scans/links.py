@@ -0,0 +1,118 @@
+# backend/app/scans/links.py
+
+from __future__ import annotations
+
+import re
+from html import unescape
+from urllib.parse import urljoin, urlsplit, urldefrag
+
+# a comment opener, or one start tag (quoted attribute values may contain ">");
+# the attribute blob is scanned separately
+_TOKEN_RE = re.compile(
+    r"""<!--|<([a-zA-Z][a-zA-Z0-9]*)\b((?:"[^"]*"|'[^']*'|[^'">])*)>"""
+)
+# attributes in order, so text inside a quoted value is never read as one;
+# only href/src are used (not data-href etc.)
+_ATTR_RE = re.compile(
+    r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?"""
+)
+# where a token may start: kept for the next feed() when it is cut off
+_OPEN_RE = re.compile(r"<(?:[a-zA-Z!]|$)")
+# links in comments and script/style bodies are not followed
+_SKIP_END = {
+    "comment": re.compile(r"-->"),
+    "script": re.compile(r"</script", re.IGNORECASE),
+    "style": re.compile(r"</style", re.IGNORECASE),
+}
+_SKIP_PREFIXES = ("#", "mailto:", "javascript:", "data:", "tel:")
+
+# an unfinished tag longer than this is dropped instead of carried over
+MAX_CARRY = 16 * 1024
+
+
+class LinkExtractor:
+    """
+    Incremental same-origin link extractor.
+
+    feed() takes decoded HTML chunks and returns the new links found in them,
+    so the crawler can enqueue while the body is still downloading.
+    Honors <base href>, dedupes, drops #fragments; skips <!-- comments -->
+    and <script>/<style> bodies, also when they span several chunks.
+    """
+
+    def __init__(self, page_url: str, origin_url: str | None = None):
+        self.base_url = page_url
+        self.origin_host = (urlsplit(origin_url or page_url).hostname or "").lower().strip(".")
+        self._carry = ""
+        self._skip: str | None = None  # inside a comment / script / style
+        self._seen: set[str] = set()
+
+    def feed(self, chunk: str) -> list[str]:
+        buf = self._carry + chunk
+        self._carry = ""
+        out: list[str] = []
+        pos = 0
+        while True:
+            if self._skip:
+                end_re = _SKIP_END[self._skip]
+                m = end_re.search(buf, pos)
+                if not m:
+                    # keep enough to find a terminator cut at the boundary
+                    keep = len(end_re.pattern) - 1
+                    self._carry = buf[max(pos, len(buf) - keep):]
+                    return out
+                pos = m.end()
+                self._skip = None
+
+            m = _TOKEN_RE.search(buf, pos)
+            if not m:
+                break
+            pos = m.end()
+            if m.group(1) is None:
+                self._skip = "comment"
+                continue
+            name = m.group(1).lower()
+            self._tag(name, m.group(2), out)
+            if name in _SKIP_END:
+                self._skip = name
+
+        # keep a tag that is cut at the chunk boundary for the next feed():
+        # every complete token before it was matched, so it starts at the first "<"
+        first = _OPEN_RE.search(buf, pos)
+        if first:
+            start = first.start()
+            if len(buf) - start > MAX_CARRY:
+                start = buf.rfind("<", pos)
+            if len(buf) - start <= MAX_CARRY:
+                self._carry = buf[start:]
+        return out
+
+    def _tag(self, name: str, attrs: str, out: list[str]):
+        is_base = name == "base"
+        for m in _ATTR_RE.finditer(attrs):
+            attr = m.group(1).lower()
+            if attr not in ("href", "src"):
+                continue
+            raw = next((g for g in m.group(2, 3, 4) if g is not None), "")
+            href = unescape(raw).strip()
+            if not href:
+                continue
+
+            if is_base:
+                if attr == "href":
+                    self.base_url = urljoin(self.base_url, href)
+                continue
+
+            if href.lower().startswith(_SKIP_PREFIXES):
+                continue
+
+            abs_url = urldefrag(urljoin(self.base_url, href))[0]
+            if abs_url in self._seen:
+                continue
+            self._seen.add(abs_url)
+
+            p = urlsplit(abs_url)
+            if p.scheme not in ("http", "https") or not p.hostname:
+                continue
+            if p.hostname.lower().strip(".") == self.origin_host:
+                out.append(abs_url)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -18,4 +18,15 @@ class Scan(Base):
     summary = Column(JSON, nullable=True)  # headers/tls/crawl metrics
     error = Column(String, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    # live crawl progress (updated on every page batch flush)
+    pages_visited = Column(Integer, nullable=True, default=0)
+    pages_seen = Column(Integer, nullable=True, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # keyset listing: WHERE user_id=? AND site_id=? AND id < cursor ORDER BY id DESC
+        Index("ix_scans_user_site_id", "user_id", "site_id", "id"),
+        # 24h scan quota: WHERE user_id=? AND created_at >= now-24h
+        Index("ix_scans_user_created", "user_id", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -11,4 +11,9 @@ class ScanPage(Base):
     url = Column(String, nullable=False)
     status_code = Column(Integer, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # keyset pages: WHERE scan_id=? AND id > cursor ORDER BY id
+        Index("ix_scan_pages_scan_id_id", "scan_id", "id"),
+    )
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import timezone
 
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.auth.deps import get_current_user
 from app.users.models import User
 from app.scans.models import Scan
@@ -10,6 +15,9 @@ from app.scans.pages_models import ScanPage
 
 router = APIRouter(prefix="/scans", tags=["scans"])
 
+EXPORT_CHUNK_ROWS = 1000
+STATUS_CLASSES = {"2xx": 200, "3xx": 300, "4xx": 400, "5xx": 500}
+
 
 def _iso(dt):
     if dt is None:
@@ -20,32 +28,99 @@ def _iso(dt):
     return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
 
 
+def _pages_query(db: Session, scan_id: int, *, cursor: int | None, status_code: list[int] | None, status_class: str | None):
+    q = (
+        db.query(ScanPage.id, ScanPage.url, ScanPage.status_code, ScanPage.created_at)
+        .filter(ScanPage.scan_id == scan_id)
+    )
+    if cursor is not None:
+        q = q.filter(ScanPage.id > cursor)
+    if status_code:
+        q = q.filter(ScanPage.status_code.in_(status_code))
+    if status_class == "error":
+        # fetch failures are stored as 0 (worker) or NULL (celery task)
+        q = q.filter((ScanPage.status_code == 0) | ScanPage.status_code.is_(None))
+    elif status_class:
+        lo = STATUS_CLASSES[status_class]
+        q = q.filter(ScanPage.status_code >= lo, ScanPage.status_code < lo + 100)
+    return q.order_by(ScanPage.id.asc())
+
+
+def _item(p) -> dict:
+    return {
+        "id": p.id,
+        "url": p.url,
+        "status_code": p.status_code,
+        "created_at": _iso(p.created_at),
+    }
+
+
+def _export_rows(scan_id: int, fmt: str, filters: dict):
+    """
+    Rows straight from a server-side cursor (yield_per), in chunks.
+    Uses its own session for the stream's lifetime; the route closes the
+    request-scoped one before returning, so an export holds one connection.
+    """
+    db = SessionLocal()
+    try:
+        q = _pages_query(db, scan_id, **filters).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        if fmt == "csv":
+            writer.writerow(["id", "url", "status_code", "created_at"])
+
+        n = 0
+        for p in q:
+            item = _item(p)
+            if fmt == "csv":
+                writer.writerow([item["id"], item["url"], item["status_code"], item["created_at"]])
+            else:
+                buf.write(json.dumps(item, separators=(",", ":")) + "\n")
+            n += 1
+            if n % EXPORT_CHUNK_ROWS == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+
+        if buf.tell():
+            yield buf.getvalue()
+    finally:
+        db.close()
+
+
 @router.get("/{scan_id}/pages")
 def list_scan_pages(
     scan_id: int,
+    limit: int = Query(default=1000, ge=1, le=5000),
+    cursor: int | None = Query(default=None, description="next_cursor from the previous page"),
+    status_code: list[int] | None = Query(default=None, description="Repeatable: status_code=404&status_code=500"),
+    status_class: str | None = Query(default=None, pattern="^(2xx|3xx|4xx|5xx|error)$"),
+    format: str = Query(default="json", pattern="^(json|ndjson|csv)$"),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     # تأكد scan ديال نفس user
-    s = db.query(Scan).filter(Scan.id == scan_id, Scan.user_id == user.id).first()
+    s = db.query(Scan.id).filter(Scan.id == scan_id, Scan.user_id == user.id).first()
     if not s:
         raise HTTPException(status_code=404, detail="Scan not found")
 
-    pages = (
-        db.query(ScanPage)
-        .filter(ScanPage.scan_id == scan_id)
-        .order_by(ScanPage.id.asc())
-        .all()
-    )
+    filters = {"cursor": cursor, "status_code": status_code, "status_class": status_class}
+
+    # export: every matching row (after cursor), streamed, no limit
+    if format != "json":
+        # yield-dependencies are torn down only after the response ends:
+        # give the request session's connection back before streaming
+        db.close()
+        media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+        return StreamingResponse(
+            _export_rows(scan_id, format, filters),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="scan-{scan_id}-pages.{format}"'},
+        )
+
+    rows = _pages_query(db, scan_id, **filters).limit(limit).all()
+    items = [_item(p) for p in rows]
+    next_cursor = rows[-1].id if len(rows) == limit else None
 
-    items = [
-        {
-            "id": p.id,
-            "url": p.url,
-            "status_code": p.status_code,
-            "created_at": _iso(p.created_at),
-        }
-        for p in pages
-    ]
-
-    return {"scan_id": scan_id, "value": items, "count": len(items)}
\ No newline at end of file
+    return {"scan_id": scan_id, "value": items, "count": len(items), "next_cursor": next_cursor}
@@ -1,11 +1,21 @@
 import ssl
 import socket
 import time
-from urllib.parse import urlparse, urljoin
-from collections import deque
+import asyncio
+import codecs
+import threading
+from typing import Callable
+from urllib.parse import urlparse
 
-from app.ssrf.http import safe_get
-from app.ssrf.guard import validate_url_target
+from app.core.config import (
+    CRAWL_CONCURRENCY,
+    CRAWL_HOST_CONCURRENCY,
+    CRAWL_MAX_HTML_BYTES,
+    CRAWL_FLUSH_PAGES,
+)
+from app.ssrf.http import make_async_client, async_safe_stream
+from app.scans.links import LinkExtractor
+from app.ssrf.guard import validate_url_target, resolve_pinned_ips
 
 def fetch_tls_info(url: str) -> dict:
     p = urlparse(url)
@@ -15,11 +25,20 @@ def fetch_tls_info(url: str) -> dict:
     if p.scheme != "https":
         return {"enabled": False}
 
-    # SSRF validation (host resolution)
+    # SSRF validation (host resolution) + connect to a validated IP
     validate_url_target(url)
+    sock, err = None, None
+    for ip in resolve_pinned_ips(host):
+        try:
+            sock = socket.create_connection((ip, port), timeout=8)
+            break
+        except OSError as e:
+            err = e
+    if sock is None:
+        raise err
 
     ctx = ssl.create_default_context()
-    with socket.create_connection((host, port), timeout=8) as sock:
+    with sock:
         with ctx.wrap_socket(sock, server_hostname=host) as ssock:
             cert = ssock.getpeercert()
             proto = ssock.version()
@@ -49,71 +68,166 @@ def public_headers_check(resp) -> dict:
     }
 
 def extract_links_same_origin(base_url: str, html: str) -> list[str]:
-    # very simple extraction to keep MVP small (no bs4)
-    # finds href="..."
-    links: list[str] = []
-    base = urlparse(base_url)
-    token = 'href="'
-    i = 0
-    while True:
-        j = html.find(token, i)
-        if j == -1:
-            break
-        j += len(token)
-        k = html.find('"', j)
-        if k == -1:
-            break
-        href = html[j:k].strip()
-        i = k + 1
-
-        if href.startswith("#") or href.startswith("mailto:") or href.startswith("javascript:"):
-            continue
-
-        abs_url = urljoin(base_url, href)
-        p = urlparse(abs_url)
-        if p.scheme not in ("http", "https") or not p.hostname:
-            continue
-        if p.hostname.lower().strip(".") == base.hostname.lower().strip("."):
-            links.append(abs_url)
-    # dedupe
-    out = []
-    seen = set()
-    for u in links:
-        if u not in seen:
-            seen.add(u)
-            out.append(u)
-    return out
-
-def crawl_light(start_url: str, *, max_pages: int, max_seconds: int) -> dict:
+    # whole-document helper; the crawler feeds LinkExtractor chunk by chunk
+    return LinkExtractor(base_url).feed(html or "")
+
+
+def _decoder(r):
+    try:
+        return codecs.getincrementaldecoder(r.charset_encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+async def crawl_light_async(
+    start_url: str,
+    *,
+    max_pages: int,
+    max_seconds: int,
+    concurrency: int = CRAWL_CONCURRENCY,
+    host_concurrency: int = CRAWL_HOST_CONCURRENCY,
+    max_html_bytes: int = CRAWL_MAX_HTML_BYTES,
+    on_pages: Callable[[list[dict], dict], None] | None = None,
+    batch_size: int = CRAWL_FLUSH_PAGES,
+    stop: threading.Event | None = None,
+) -> dict:
+    """
+    Concurrent BFS: `concurrency` workers share one frontier; each host gets
+    at most `host_concurrency` requests in flight.
+    Same contract as before: stop at max_pages / max_seconds, return pages + metrics.
+
+    on_pages(batch, metrics): called every `batch_size` pages (and once at the end)
+    in a worker thread, never on the event loop; calls are serialized and in order.
+    Pages handed to it are not kept, so "pages" in the result stays empty.
+
+    stop: once set (from any thread), no new URL is taken from the frontier;
+    fetches in flight finish and the crawl returns what it has so far.
+    """
     start = time.time()
-    q = deque([start_url])
+    frontier: asyncio.Queue[str] = asyncio.Queue()
+    frontier.put_nowait(start_url)
     seen = set([start_url])
     pages: list[dict] = []
+    batch: list[dict] = []
+    visited = 0
+    started = 0
+    host_windows: dict[str, asyncio.Semaphore] = {}
 
-    while q:
-        if len(pages) >= max_pages:
-            break
-        if time.time() - start > max_seconds:
-            break
+    def metrics() -> dict:
+        return {
+            "visited": visited,
+            "unique_seen": len(seen),
+            "time_spent_sec": int(time.time() - start),
+        }
 
-        url = q.popleft()
+    # on_pages does blocking DB work: run it in a thread, one batch at a time
+    # (asyncio.Lock wakes waiters FIFO, so batches are written in order)
+    write_lock = asyncio.Lock()
+    writes: list[asyncio.Task] = []
+
+    async def write(b: list[dict], m: dict):
+        async with write_lock:
+            await asyncio.to_thread(on_pages, b, m)
+
+    def flush():
+        if batch and on_pages:
+            writes.append(asyncio.create_task(write(list(batch), metrics())))
+            batch.clear()
+
+    def record(page: dict):
+        nonlocal visited
+        visited += 1
+        if on_pages is None:
+            pages.append(page)
+            return
+        batch.append(page)
+        if len(batch) >= batch_size:
+            flush()
+
+    def host_window(url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower().strip(".")
+        if host not in host_windows:
+            host_windows[host] = asyncio.Semaphore(host_concurrency)
+        return host_windows[host]
+
+    async def read_links(r, url: str):
+        # stream the body, capped at max_html_bytes; links are enqueued per chunk
+        extractor = LinkExtractor(url, start_url)
+        decoder = _decoder(r)
+        left = max_html_bytes
+        async for chunk in r.aiter_bytes():
+            chunk = chunk[:left]
+            left -= len(chunk)
+            for link in extractor.feed(decoder.decode(chunk, final=left <= 0)):
+                if link not in seen and len(seen) < (max_pages * 5):  # small cap against explosion
+                    seen.add(link)
+                    frontier.put_nowait(link)
+            if left <= 0:
+                break
+
+    async def fetch(client, url: str):
+        async with host_window(url):
+            try:
+                async with async_safe_stream(client, url, timeout=8) as r:
+                    record({"url": url, "status_code": r.status_code})
+                    ctype = (r.headers.get("content-type") or "").lower()
+                    if "text/html" in ctype:
+                        try:
+                            await read_links(r, url)
+                        except Exception:
+                            pass  # body broke off: keep the links found so far
+            except Exception:
+                record({"url": url, "status_code": None})
+
+    async def worker(client):
+        nonlocal started
+        while True:
+            url = await frontier.get()
+            try:
+                # past the limits / stopped: just drain the frontier so join() returns
+                if (
+                    started >= max_pages
+                    or time.time() - start > max_seconds
+                    or (stop and stop.is_set())
+                ):
+                    continue
+                started += 1
+                await fetch(client, url)
+            finally:
+                frontier.task_done()
+
+    async with make_async_client(max_connections=concurrency) as client:
+        workers = [asyncio.create_task(worker(client)) for _ in range(concurrency)]
         try:
-            r = safe_get(url, timeout=8)
-            pages.append({"url": url, "status_code": r.status_code})
-            ctype = (r.headers.get("content-type") or "").lower()
-            if "text/html" in ctype and r.text:
-                for link in extract_links_same_origin(start_url, r.text):
-                    if link not in seen and len(seen) < (max_pages * 5):  # small cap against explosion
-                        seen.add(link)
-                        q.append(link)
-        except Exception:
-            pages.append({"url": url, "status_code": None})
+            await frontier.join()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
+    flush()
+    await asyncio.gather(*writes)  # all batches persisted (first write error propagates)
     return {
         "pages": pages,
-        "metrics": {
-            "visited": len(pages),
-            "unique_seen": len(seen),
-            "time_spent_sec": int(time.time() - start),
-        }
-    }
\ No newline at end of file
+        "metrics": metrics(),
+    }
+
+
+def crawl_light(
+    start_url: str,
+    *,
+    max_pages: int,
+    max_seconds: int,
+    on_pages: Callable[[list[dict], dict], None] | None = None,
+    stop: threading.Event | None = None,
+) -> dict:
+    # sync entrypoint for the worker thread / celery task
+    return asyncio.run(
+        crawl_light_async(
+            start_url,
+            max_pages=max_pages,
+            max_seconds=max_seconds,
+            on_pages=on_pages,
+            stop=stop,
+        )
+    )
@@ -0,0 +1,65 @@
+# backend/app/scans/queue_signal.py
+
+"""
+Wake idle scan workers as soon as a scan is queued:
+  - same process: asyncio.Event owned by the worker loop
+  - other nodes (Postgres): NOTIFY scans_queued -> LISTEN thread -> same Event
+The worker keeps a slow poll only as a fallback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from app.db.notify import PgListener, notify
+
+CHANNEL = "scans_queued"
+
+_loop: asyncio.AbstractEventLoop | None = None
+_event: asyncio.Event | None = None
+
+_listener = PgListener(CHANNEL, lambda _payload: _wake_local(), name="scans-queue-listener")
+
+
+def attach_worker(loop: asyncio.AbstractEventLoop, event: asyncio.Event):
+    global _loop, _event
+    _loop, _event = loop, event
+
+
+def detach_worker():
+    global _loop, _event
+    _loop, _event = None, None
+    _listener.stop()
+
+
+def _wake_local():
+    loop, event = _loop, _event
+    if not loop or not event:
+        return
+    try:
+        # routes are sync (threadpool) -> hop onto the worker loop
+        loop.call_soon_threadsafe(event.set)
+    except RuntimeError:
+        pass  # loop already closed (shutdown)
+
+
+def notify_scan_queued(db: Session):
+    """
+    Call right after the queued Scan row is committed.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        try:
+            notify(db, CHANNEL)
+            db.commit()
+        except Exception:
+            db.rollback()
+    _wake_local()
+
+
+def start_listener():
+    """
+    Multi-node wakeups; no-op on SQLite (single node).
+    """
+    _listener.start()
@@ -1,6 +1,6 @@
 # backend/app/scans/routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from datetime import datetime, timezone, timedelta
@@ -11,14 +11,13 @@ from app.users.models import User
 from app.sites.models import Site
 from app.scans.models import Scan
 from app.plans.limits import get_user_plan
+from app.plans.quotas import enforce_scan_quota
+from app.scans.queue_signal import notify_scan_queued
+from app.sites.reverify import is_verification_fresh
 
 router = APIRouter(prefix="/scans", tags=["scans"])
 
 
-FREE_SCANS_PER_24H = 3
-PAID_SCANS_PER_24H = 200
-
-
 def _as_utc(dt):
     if dt is None:
         return None
@@ -47,38 +46,6 @@ def _latest_scan(db: Session, *, user_id: int, site_id: int, scan_type: str):
     )
 
 
-def _enforce_rate_limit_24h(db: Session, user: User, plan):
-    """
-    Free: 3 scans / 24h
-    Paid: 200 scans / 24h
-    (count all scan types)
-    """
-    now = datetime.now(timezone.utc)
-    cutoff = now - timedelta(hours=24)
-
-    # SQLite might store naive dt; simplest: fetch recent N and count in python
-    recent = (
-        db.query(Scan)
-        .filter(Scan.user_id == user.id)
-        .order_by(desc(Scan.id))
-        .limit(500)  # safe cap
-        .all()
-    )
-
-    used = 0
-    for s in recent:
-        created = _as_utc(s.created_at)
-        if created and created >= cutoff:
-            used += 1
-
-    limit = FREE_SCANS_PER_24H if plan.name == "free" else PAID_SCANS_PER_24H
-    if used >= limit:
-        raise HTTPException(
-            status_code=429,
-            detail=f"Rate limit: {limit} scans per 24h (used={used}).",
-        )
-
-
 @router.post("/sites/{site_id}/public")
 def enqueue_public_scan(
     site_id: int,
@@ -92,7 +59,7 @@ def enqueue_public_scan(
     plan = get_user_plan(db, user)
 
     # ✅ rate limit (free/paid)
-    _enforce_rate_limit_24h(db, user, plan)
+    enforce_scan_quota(db, user.id, plan)
 
     # Free retest cooldown (30min) based on last PUBLIC scan time
     if plan.name == "free":
@@ -118,6 +85,7 @@ def enqueue_public_scan(
     db.add(scan)
     db.commit()
     db.refresh(scan)
+    notify_scan_queued(db)
 
     return {"scan_id": scan.id, "status": scan.status, "created_at": _iso(scan.created_at)}
 
@@ -134,13 +102,15 @@ def enqueue_advanced_scan(
 
     if not site.is_verified:
         raise HTTPException(status_code=403, detail="Site must be verified before advanced scans")
+    if not is_verification_fresh(site):
+        raise HTTPException(status_code=403, detail="Site ownership verification is stale, verify the site again")
 
     plan = get_user_plan(db, user)
     if plan.name == "free":
         raise HTTPException(status_code=403, detail="Advanced scans are not available on Free plan")
 
     # ✅ rate limit (paid too)
-    _enforce_rate_limit_24h(db, user, plan)
+    enforce_scan_quota(db, user.id, plan)
 
     # optional short cooldown (20s) based on last ADVANCED scan time
     last_adv = _latest_scan(db, user_id=user.id, site_id=site.id, scan_type="advanced")
@@ -162,42 +132,82 @@ def enqueue_advanced_scan(
     db.add(scan)
     db.commit()
     db.refresh(scan)
+    notify_scan_queued(db)
 
     return {"scan_id": scan.id, "status": scan.status, "created_at": _iso(scan.created_at)}
 
 
+# fields=... projection for GET /scans (summary is opt-in: it's the big one)
+LIST_FIELDS = {
+    "status": (Scan.status,),
+    "scan_type": (Scan.scan_type,),
+    "created_at": (Scan.created_at,),
+    "started_at": (Scan.started_at,),
+    "finished_at": (Scan.finished_at,),
+    "error": (Scan.error,),
+    "progress": (Scan.pages_visited, Scan.pages_seen),
+    # light aggregate straight from the JSON column (no full summary load)
+    "risk": (
+        Scan.summary[("risk", "score")].as_integer().label("risk_score"),
+        Scan.summary[("risk", "label")].as_string().label("risk_label"),
+    ),
+    "summary": (Scan.summary,),
+}
+DEFAULT_LIST_FIELDS = [f for f in LIST_FIELDS if f != "summary"]
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return DEFAULT_LIST_FIELDS
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in LIST_FIELDS and f != "id"]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [f for f in LIST_FIELDS if f in wanted]
+
+
+def _list_item(row, fields: list[str]) -> dict:
+    item = {"id": row.id}
+    for f in fields:
+        if f == "progress":
+            item["progress"] = {"pages_visited": row.pages_visited or 0, "pages_seen": row.pages_seen or 0}
+        elif f == "risk":
+            item["risk"] = {"score": row.risk_score, "label": row.risk_label}
+        elif f in ("created_at", "started_at", "finished_at"):
+            item[f] = _iso(getattr(row, f))
+        else:
+            item[f] = getattr(row, f)
+    return item
+
+
 @router.get("")
 def list_scans(
     site_id: int,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: int | None = Query(default=None, description="next_cursor from the previous page"),
+    fields: str | None = Query(default=None, description="Comma list; summary is excluded by default"),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    site = db.query(Site).filter(Site.id == site_id, Site.user_id == user.id).first()
+    site = db.query(Site.id).filter(Site.id == site_id, Site.user_id == user.id).first()
     if not site:
         raise HTTPException(status_code=404, detail="Site not found")
 
-    scans = (
-        db.query(Scan)
-        .filter(Scan.user_id == user.id, Scan.site_id == site.id)
-        .order_by(Scan.id.desc())
-        .all()
-    )
+    selected = _parse_fields(fields)
+    columns = [Scan.id]
+    for f in selected:
+        columns.extend(LIST_FIELDS[f])
+
+    # keyset pagination on Scan.id (newest first), served by ix_scans_user_site_id
+    q = db.query(*columns).filter(Scan.user_id == user.id, Scan.site_id == site.id)
+    if cursor is not None:
+        q = q.filter(Scan.id < cursor)
+    rows = q.order_by(Scan.id.desc()).limit(limit).all()
 
-    items = [
-        {
-            "id": s.id,
-            "status": s.status,
-            "scan_type": s.scan_type,
-            "created_at": _iso(s.created_at),
-            "started_at": _iso(s.started_at),
-            "finished_at": _iso(s.finished_at),
-            "summary": s.summary,
-            "error": s.error,
-        }
-        for s in scans
-    ]
+    items = [_list_item(r, selected) for r in rows]
+    next_cursor = rows[-1].id if len(rows) == limit else None
 
-    return {"value": items, "count": len(items)}
+    return {"value": items, "count": len(items), "next_cursor": next_cursor}
 
 
 @router.get("/{scan_id}")
@@ -217,6 +227,7 @@ def get_scan(
         "created_at": _iso(s.created_at),
         "started_at": _iso(s.started_at),
         "finished_at": _iso(s.finished_at),
+        "progress": {"pages_visited": s.pages_visited or 0, "pages_seen": s.pages_seen or 0},
         "summary": s.summary,
         "error": s.error,
     }
\ No newline at end of file
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ScanSchedule(Base):
+    __tablename__ = "scan_schedules"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    site_id = Column(Integer, ForeignKey("sites.id"), index=True, nullable=False)
+
+    scan_type = Column(String, nullable=False, default="public")  # public | advanced
+
+    # exactly one of: 5-field cron (UTC) or a fixed interval
+    cron = Column(String, nullable=True)
+    interval_minutes = Column(Integer, nullable=True)
+
+    # max spread (seconds) added to each run; the offset is fixed per schedule
+    jitter_seconds = Column(Integer, nullable=False, default=0)
+
+    enabled = Column(Boolean, nullable=False, default=True)
+    next_run_at = Column(DateTime(timezone=True), nullable=False)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    last_scan_id = Column(Integer, ForeignKey("scans.id"), nullable=True)
+    # why the last due run did not enqueue a scan (quota, plan, unverified...)
+    last_skip_reason = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # scheduler: WHERE enabled AND next_run_at <= now ORDER BY next_run_at
+        Index("ix_scan_schedules_enabled_next_run", "enabled", "next_run_at"),
+        # one schedule per site + scan type, enforced by the DB (concurrent creates)
+        # unique index rather than UniqueConstraint: init_db backfills indexes on existing tables
+        Index("uq_scan_schedules_site_type", "site_id", "scan_type", unique=True),
+    )
@@ -0,0 +1,219 @@
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.auth.deps import get_current_user
+from app.users.models import User
+from app.sites.models import Site
+from app.plans.limits import get_user_plan
+from app.core.config import SCHEDULER_DEFAULT_JITTER_SECONDS, SCHEDULE_MIN_INTERVAL_MINUTES
+from app.scans.schedule_models import ScanSchedule
+from app.scans.cron import parse_cron, min_gap_minutes
+from app.scans.scheduler import compute_next_run_at
+
+router = APIRouter(prefix="/schedules", tags=["schedules"])
+
+MAX_JITTER_SECONDS = 6 * 3600
+
+
+class ScheduleCreate(BaseModel):
+    site_id: int
+    scan_type: Literal["public", "advanced"] = "public"
+    cron: str | None = Field(default=None, description='5-field cron in UTC, e.g. "0 3 * * *"')
+    interval_minutes: int | None = None
+    jitter_seconds: int | None = Field(default=None, ge=0, le=MAX_JITTER_SECONDS)
+    enabled: bool = True
+
+
+class ScheduleUpdate(BaseModel):
+    cron: str | None = None
+    interval_minutes: int | None = None
+    jitter_seconds: int | None = Field(default=None, ge=0, le=MAX_JITTER_SECONDS)
+    enabled: bool | None = None
+
+
+def _iso(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def _require_scheduling(db: Session, user: User):
+    plan = get_user_plan(db, user)
+    if not plan.allow_scheduling:
+        raise HTTPException(status_code=403, detail="Scheduled scans are not available on your plan")
+    return plan
+
+
+def _validate_timing(cron: str | None, interval_minutes: int | None):
+    if bool(cron) == (interval_minutes is not None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of cron or interval_minutes")
+    if cron:
+        try:
+            gap = min_gap_minutes(parse_cron(cron))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if gap < SCHEDULE_MIN_INTERVAL_MINUTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"cron must not run more often than every {SCHEDULE_MIN_INTERVAL_MINUTES} minutes",
+            )
+    elif interval_minutes < SCHEDULE_MIN_INTERVAL_MINUTES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"interval_minutes must be at least {SCHEDULE_MIN_INTERVAL_MINUTES}",
+        )
+
+    # finds a next run: a valid cron can still never fire (e.g. "0 0 30 2 *"),
+    # which would otherwise surface as a 500 in _reschedule
+    try:
+        compute_next_run_at(
+            cron=cron,
+            interval_minutes=interval_minutes,
+            site_id=0,
+            scan_type="",
+            jitter_seconds=0,
+            now=datetime.now(timezone.utc),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _reschedule(s: ScanSchedule):
+    s.next_run_at = compute_next_run_at(
+        cron=s.cron,
+        interval_minutes=s.interval_minutes,
+        site_id=s.site_id,
+        scan_type=s.scan_type,
+        jitter_seconds=s.jitter_seconds or 0,
+        now=datetime.now(timezone.utc),
+    )
+
+
+def _schedule_out(s: ScanSchedule) -> dict:
+    return {
+        "id": s.id,
+        "site_id": s.site_id,
+        "scan_type": s.scan_type,
+        "cron": s.cron,
+        "interval_minutes": s.interval_minutes,
+        "jitter_seconds": s.jitter_seconds,
+        "enabled": s.enabled,
+        "next_run_at": _iso(s.next_run_at),
+        "last_run_at": _iso(s.last_run_at),
+        "last_scan_id": s.last_scan_id,
+        "last_skip_reason": s.last_skip_reason,
+    }
+
+
+def _get_owned(db: Session, user: User, schedule_id: int) -> ScanSchedule:
+    s = db.query(ScanSchedule).filter(ScanSchedule.id == schedule_id, ScanSchedule.user_id == user.id).first()
+    if not s:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return s
+
+
+@router.post("")
+def create_schedule(body: ScheduleCreate, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    plan = _require_scheduling(db, user)
+
+    site = db.query(Site).filter(Site.id == body.site_id, Site.user_id == user.id).first()
+    if not site:
+        raise HTTPException(status_code=404, detail="Site not found")
+
+    if body.scan_type == "advanced":
+        if plan.name == "free":
+            raise HTTPException(status_code=403, detail="Advanced scans are not available on Free plan")
+        if not site.is_verified:
+            raise HTTPException(status_code=403, detail="Site must be verified before advanced scans")
+
+    _validate_timing(body.cron, body.interval_minutes)
+
+    exists = (
+        db.query(ScanSchedule.id)
+        .filter(ScanSchedule.site_id == site.id, ScanSchedule.scan_type == body.scan_type)
+        .first()
+    )
+    if exists:
+        raise HTTPException(status_code=409, detail="A schedule for this site and scan type already exists")
+
+    s = ScanSchedule(
+        user_id=user.id,
+        site_id=site.id,
+        scan_type=body.scan_type,
+        cron=body.cron or None,
+        interval_minutes=body.interval_minutes,
+        jitter_seconds=SCHEDULER_DEFAULT_JITTER_SECONDS if body.jitter_seconds is None else body.jitter_seconds,
+        enabled=body.enabled,
+    )
+    _reschedule(s)
+    db.add(s)
+    try:
+        db.commit()
+    except IntegrityError:
+        # lost a race with a concurrent create (uq_scan_schedules_site_type)
+        db.rollback()
+        raise HTTPException(status_code=409, detail="A schedule for this site and scan type already exists")
+    db.refresh(s)
+    return _schedule_out(s)
+
+
+@router.get("")
+def list_schedules(
+    site_id: int | None = None,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    q = db.query(ScanSchedule).filter(ScanSchedule.user_id == user.id)
+    if site_id is not None:
+        q = q.filter(ScanSchedule.site_id == site_id)
+    items = [_schedule_out(s) for s in q.order_by(ScanSchedule.id.asc()).all()]
+    return {"value": items, "count": len(items)}
+
+
+@router.patch("/{schedule_id}")
+def update_schedule(
+    schedule_id: int,
+    body: ScheduleUpdate,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    _require_scheduling(db, user)
+    s = _get_owned(db, user, schedule_id)
+    changes = body.model_dump(exclude_unset=True)
+
+    if "cron" in changes or "interval_minutes" in changes:
+        # switching kind: the other one is cleared unless given too
+        cron = changes.get("cron") if "cron" in changes else (None if "interval_minutes" in changes else s.cron)
+        interval = (
+            changes.get("interval_minutes")
+            if "interval_minutes" in changes
+            else (None if "cron" in changes else s.interval_minutes)
+        )
+        _validate_timing(cron, interval)
+        s.cron = cron or None
+        s.interval_minutes = interval
+    if changes.get("jitter_seconds") is not None:
+        s.jitter_seconds = changes["jitter_seconds"]
+    if changes.get("enabled") is not None:
+        s.enabled = changes["enabled"]
+
+    _reschedule(s)
+    db.commit()
+    db.refresh(s)
+    return _schedule_out(s)
+
+
+@router.delete("/{schedule_id}")
+def delete_schedule(schedule_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    s = _get_owned(db, user, schedule_id)
+    db.delete(s)
+    db.commit()
+    return {"ok": True, "id": schedule_id}
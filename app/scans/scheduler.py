@@ -0,0 +1,222 @@
+# backend/app/scans/scheduler.py
+
+"""
+Recurring scans: one leader loop turns due ScanSchedule rows into queued scans.
+
+Every SCHEDULER_POLL_SECONDS the cluster leader (advisory lock) takes due
+schedules in batches of SCHEDULER_BATCH, bulk-inserts their scans, moves each
+schedule to its next run and wakes the scan workers once per batch.
+
+Jitter: each schedule runs at its cron/interval time + a fixed offset in
+[0, jitter_seconds], derived from (site_id, scan_type). Thousands of
+"0 0 * * *" schedules therefore spread over the jitter window instead of
+hitting the queue in the same second, and each one keeps a stable run time.
+
+A due run is skipped (last_skip_reason recorded, schedule still advanced) when
+the plan no longer allows scheduling, the 24h scan quota is used up, an
+advanced scan's site verification is stale, or the previous scan of that
+schedule is still queued/running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, update
+
+from app.core.config import SCHEDULER_POLL_SECONDS, SCHEDULER_BATCH
+from app.db.locks import AdvisoryLock
+from app.db.session import SessionLocal
+from app.plans.models import Plan
+from app.plans.quotas import scan_limit, scans_used
+from app.scans.cron import next_run, parse_cron
+from app.scans.models import Scan
+from app.scans.queue_signal import notify_scan_queued
+from app.scans.schedule_models import ScanSchedule
+from app.sites.models import Site
+from app.sites.reverify import is_verification_fresh
+from app.users.models import User
+
+LOCK_NAME = "scan_scheduler"
+
+# interval schedules run on fixed slots counted from here
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def jitter_offset(site_id: int, scan_type: str, jitter_seconds: int) -> timedelta:
+    if not jitter_seconds or jitter_seconds <= 0:
+        return timedelta(0)
+    h = int.from_bytes(hashlib.sha256(f"{site_id}:{scan_type}".encode("utf-8")).digest()[:4], "big")
+    return timedelta(seconds=h % (jitter_seconds + 1))
+
+
+def compute_next_run_at(
+    *,
+    cron: str | None,
+    interval_minutes: int | None,
+    site_id: int,
+    scan_type: str,
+    jitter_seconds: int,
+    now: datetime,
+) -> datetime:
+    """
+    Next (jittered) run strictly after `now`.
+    The offset is added to an unjittered base: the cron time, or for intervals
+    the next epoch-aligned slot (not now + interval, where the offset would
+    cancel out and schedules due in the same tick would stay in lockstep).
+    Base times are computed from now - offset, so a run that fired late by its
+    own jitter never skips the following slot.
+    """
+    offset = jitter_offset(site_id, scan_type, jitter_seconds)
+    after = now - offset
+    if cron:
+        base = next_run(parse_cron(cron), after)
+    else:
+        step = timedelta(minutes=int(interval_minutes))
+        base = _EPOCH + ((after - _EPOCH) // step + 1) * step
+    return base + offset
+
+
+def _next_for(schedule: ScanSchedule, now: datetime) -> datetime:
+    return compute_next_run_at(
+        cron=schedule.cron,
+        interval_minutes=schedule.interval_minutes,
+        site_id=schedule.site_id,
+        scan_type=schedule.scan_type,
+        jitter_seconds=schedule.jitter_seconds or 0,
+        now=now,
+    )
+
+
+def _run_batch(now: datetime) -> tuple[int, int]:
+    """
+    One batch of due schedules. Returns (due schedules seen, scans enqueued).
+    """
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ScanSchedule, Site, Plan)
+            .join(Site, (Site.id == ScanSchedule.site_id) & (Site.user_id == ScanSchedule.user_id))
+            .join(User, User.id == ScanSchedule.user_id)
+            .join(Plan, Plan.id == User.plan_id)
+            .filter(ScanSchedule.enabled.is_(True), ScanSchedule.next_run_at <= now)
+            .order_by(ScanSchedule.next_run_at.asc())
+            .limit(SCHEDULER_BATCH)
+            .all()
+        )
+        if not rows:
+            return 0, 0
+
+        # previous scans of these schedules still in the queue / running
+        busy = {
+            (site_id, scan_type)
+            for site_id, scan_type in db.query(Scan.site_id, Scan.scan_type)
+            .filter(
+                Scan.site_id.in_({site.id for _s, site, _p in rows}),
+                Scan.status.in_(("queued", "running")),
+            )
+            .distinct()
+            .all()
+        }
+
+        # quota: one capped COUNT per user in the batch, then counted locally
+        used: dict[int, int] = {}
+        limits: dict[int, int] = {}
+
+        to_enqueue: list[ScanSchedule] = []
+        skipped: dict[int, str] = {}
+
+        for schedule, site, plan in rows:
+            uid = schedule.user_id
+            if uid not in used:
+                limits[uid] = scan_limit(plan)
+                used[uid] = scans_used(db, uid, cap=limits[uid])
+
+            if not plan.allow_scheduling:
+                skipped[schedule.id] = "plan does not allow scheduling"
+            elif schedule.scan_type == "advanced" and (plan.name == "free" or not is_verification_fresh(site, now)):
+                skipped[schedule.id] = "site verification missing or stale"
+            elif (site.id, schedule.scan_type) in busy:
+                skipped[schedule.id] = "previous scan still queued or running"
+            elif used[uid] >= limits[uid]:
+                skipped[schedule.id] = "24h scan quota reached"
+            else:
+                used[uid] += 1
+                busy.add((site.id, schedule.scan_type))
+                to_enqueue.append(schedule)
+
+        scan_ids: list[int] = []
+        if to_enqueue:
+            scan_ids = list(
+                db.execute(
+                    insert(Scan).returning(Scan.id, sort_by_parameter_order=True),
+                    [
+                        {
+                            "user_id": s.user_id,
+                            "site_id": s.site_id,
+                            "scan_type": s.scan_type,
+                            "status": "queued",
+                        }
+                        for s in to_enqueue
+                    ],
+                ).scalars()
+            )
+        scan_by_schedule = {s.id: sid for s, sid in zip(to_enqueue, scan_ids)}
+
+        # bulk UPDATE by primary key (executemany)
+        updates = []
+        for schedule, _site, _plan in rows:
+            item = {
+                "id": schedule.id,
+                "next_run_at": _next_for(schedule, now),
+                "last_run_at": now,
+                "last_skip_reason": skipped.get(schedule.id),
+            }
+            if schedule.id in scan_by_schedule:
+                item["last_scan_id"] = scan_by_schedule[schedule.id]
+            updates.append(item)
+        # executemany needs one key set per statement; skipped rows keep last_scan_id
+        with_scan = [u for u in updates if "last_scan_id" in u]
+        without_scan = [u for u in updates if "last_scan_id" not in u]
+        if with_scan:
+            db.execute(update(ScanSchedule), with_scan)
+        if without_scan:
+            db.execute(update(ScanSchedule), without_scan)
+        db.commit()
+
+        if scan_ids:
+            notify_scan_queued(db)
+        return len(rows), len(scan_ids)
+    finally:
+        db.close()
+
+
+def run_due_schedules(now: datetime | None = None) -> dict:
+    now = now or datetime.now(timezone.utc)
+    stats = {"due": 0, "enqueued": 0}
+    while True:
+        due, enqueued = _run_batch(now)
+        stats["due"] += due
+        stats["enqueued"] += enqueued
+        if due < SCHEDULER_BATCH:
+            return stats
+
+
+async def scheduler_loop(poll_seconds: float = SCHEDULER_POLL_SECONDS):
+    lock = AdvisoryLock(LOCK_NAME)
+    while True:
+        try:
+            if await asyncio.to_thread(lock.acquire):
+                try:
+                    stats = await asyncio.to_thread(run_due_schedules)
+                finally:
+                    await asyncio.to_thread(lock.release)
+                if stats["due"]:
+                    print("[scheduler]", stats)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[scheduler] tick failed: {e!r}")
+        await asyncio.sleep(poll_seconds)
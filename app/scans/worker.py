@@ -1,9 +1,17 @@
 # backend/app/scans/worker.py
 
 import asyncio
+import threading
 from datetime import datetime, timezone
+from sqlalchemy import select, update, insert, or_
 from sqlalchemy.orm import Session
 
+from app.core.config import (
+    SCAN_WORKER_PRIORITY_SLOTS,
+    SCAN_WORKER_STANDARD_SLOTS,
+    SCAN_WORKER_DRAIN_SECONDS,
+    SCAN_WORKER_POLL_SECONDS,
+)
 from app.db.session import SessionLocal
 from app.scans.models import Scan
 from app.sites.models import Site
@@ -14,53 +22,110 @@ from app.plans.models import Plan
 from app.scans.pages_models import ScanPage
 from app.scans.public_scan import fetch_tls_info, public_headers_check, crawl_light
 from app.ssrf.http import safe_get
+from app.scans.queue_signal import attach_worker, detach_worker, start_listener
+from app.scans.events import notify_scan_changed
+from app.reports.cache import invalidate_scan as invalidate_report_cache
+from app.reports.prerender import submit_prerender
+
+
+def _queued_scan_ids(*, paid: bool | None):
+    # paid=True: priority_queue plans only, False: the others, None: any plan
+    q = select(Scan.id).where(Scan.status == "queued")
+    if paid is not None:
+        q = q.join(User, User.id == Scan.user_id).join(Plan, Plan.id == User.plan_id)
+        if paid:
+            q = q.where(Plan.priority_queue.is_(True))
+        else:
+            q = q.where(or_(Plan.priority_queue.is_(False), Plan.priority_queue.is_(None)))
+    return q.order_by(Scan.id.asc()).limit(1)
 
 
-def _claim_next_scan(db: Session) -> Scan | None:
-    """
-    Priority queue:
-      1) Paid users (plan.priority_queue=True)
-      2) Free users (FIFO)
+def _claim_scan_id(db: Session, *, paid: bool | None) -> int | None:
     """
-    paid_scan = (
-        db.query(Scan)
-        .join(User, User.id == Scan.user_id)
-        .join(Plan, Plan.id == User.plan_id)
-        .filter(Scan.status == "queued")
-        .filter(Plan.priority_queue.is_(True))
-        .order_by(Scan.id.asc())
-        .first()
-    )
+    Atomically flip one queued scan to running and return its id.
 
-    s = paid_scan
-    if not s:
-        s = (
-            db.query(Scan)
-            .filter(Scan.status == "queued")
-            .order_by(Scan.id.asc())
-            .first()
+    Postgres: UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING id
+      -> concurrent workers skip rows another transaction is claiming.
+    SQLite: pick a candidate, then guarded UPDATE ... WHERE status='queued';
+      rowcount 0 means another worker won the race -> try the next one.
+    """
+    now = datetime.now(timezone.utc)
+    candidate = _queued_scan_ids(paid=paid)
+
+    if db.get_bind().dialect.name == "postgresql":
+        candidate = candidate.with_for_update(skip_locked=True, of=Scan.__table__)
+        stmt = (
+            update(Scan)
+            .where(Scan.id == candidate.scalar_subquery())
+            .values(status="running", started_at=now)
+            .returning(Scan.id)
+            .execution_options(synchronize_session=False)
+        )
+        scan_id = db.execute(stmt).scalar()
+        db.commit()
+        return scan_id
+
+    for _ in range(5):
+        scan_id = db.execute(candidate).scalar()
+        if scan_id is None:
+            return None
+
+        res = db.execute(
+            update(Scan)
+            .where(Scan.id == scan_id, Scan.status == "queued")
+            .values(status="running", started_at=now)
+            .execution_options(synchronize_session=False)
         )
+        db.commit()
+        if res.rowcount == 1:
+            return scan_id
+    return None
 
-    if not s:
-        return None
 
-    s.status = "running"
-    s.started_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(s)
-    return s
-
-
-def _store_pages(db: Session, scan_id: int, pages: list[dict]):
-    for p in pages or []:
-        db.add(
-            ScanPage(
-                scan_id=scan_id,
-                url=p.get("url"),
-                status_code=int(p.get("status_code") or 0),
-            )
+def _claim_next_scan(db: Session, *, priority_only: bool = False) -> int | None:
+    """
+    priority_only=True (priority slots): paid users only (plan.priority_queue=True), FIFO.
+    Otherwise (standard slots): free users first (FIFO), then paid overflow,
+    so a paid backlog can't take the free users' slots.
+    Safe to call from several worker processes / API replicas at once.
+    """
+    if priority_only:
+        return _claim_scan_id(db, paid=True)
+    scan_id = _claim_scan_id(db, paid=False)
+    if scan_id is None:
+        scan_id = _claim_scan_id(db, paid=None)
+    return scan_id
+
+
+def _page_flusher(db: Session, scan_id: int):
+    """
+    crawl_light on_pages callback: one multi-row INSERT per batch
+    (insertmanyvalues) + progress counters on the Scan row, committed together,
+    so a crash keeps everything crawled so far. The crawler calls it in a worker
+    thread, one batch at a time, so the session is never used concurrently.
+    """
+    def flush(batch: list[dict], metrics: dict):
+        db.execute(
+            insert(ScanPage),
+            [
+                {
+                    "scan_id": scan_id,
+                    "url": p.get("url"),
+                    "status_code": int(p.get("status_code") or 0),
+                }
+                for p in batch
+            ],
         )
-    db.commit()
+        db.execute(
+            update(Scan)
+            .where(Scan.id == scan_id)
+            .values(pages_visited=metrics["visited"], pages_seen=metrics["unique_seen"])
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        notify_scan_changed(scan_id)
+
+    return flush
 
 
 def _get_site_and_plan(db: Session, scan: Scan) -> tuple[Site, object]:
@@ -108,7 +173,7 @@ def _compute_risk(findings: list[dict]) -> dict:
     return {"score": score, "label": label, "counts": counts}
 
 
-def _run_public(db: Session, scan: Scan):
+def _run_public(db: Session, scan: Scan, stop: threading.Event | None = None):
     site, plan = _get_site_and_plan(db, scan)
 
     resp = safe_get(site.url, timeout=10)
@@ -119,9 +184,12 @@ def _run_public(db: Session, scan: Scan):
         site.url,
         max_pages=int(plan.crawl_limit),
         max_seconds=int(plan.max_duration_min) * 60,
+        on_pages=_page_flusher(db, scan.id),
+        stop=stop,
     )
-
-    _store_pages(db, scan.id, crawl_result.get("pages", []))
+    if stop and stop.is_set():
+        # partial crawl: fail it rather than report a truncated site as done
+        raise RuntimeError("Scan interrupted by worker shutdown")
 
     scan.summary = {
         "headers": headers_result,
@@ -132,8 +200,8 @@ def _run_public(db: Session, scan: Scan):
     }
 
 
-def _run_advanced(db: Session, scan: Scan):
-    _run_public(db, scan)
+def _run_advanced(db: Session, scan: Scan, stop: threading.Event | None = None):
+    _run_public(db, scan, stop)
 
     summary = scan.summary or {}
     sec = (summary.get("headers") or {}).get("security_headers") or {}
@@ -174,44 +242,166 @@ def _fail_scan(db: Session, scan_id: int, err: Exception):
     s.error = (str(err) or "unknown error")[:500]
     s.finished_at = datetime.now(timezone.utc)
     db.commit()
+    notify_scan_changed(scan_id)
 
 
-def _run_one(scan_id: int):
+def _run_one(scan_id: int, stop: threading.Event | None = None):
     db = SessionLocal()
     try:
         s = db.query(Scan).filter(Scan.id == scan_id).first()
         if not s:
             return
 
+        # any report rendered for an earlier run of this scan is stale now
+        invalidate_report_cache(scan_id)
+
         if s.scan_type == "public":
-            _run_public(db, s)
+            _run_public(db, s, stop)
         elif s.scan_type == "advanced":
-            _run_advanced(db, s)
+            _run_advanced(db, s, stop)
         else:
             raise RuntimeError(f"Unknown scan_type: {s.scan_type}")
 
         s.status = "done"
         s.finished_at = datetime.now(timezone.utc)
         db.commit()
+        notify_scan_changed(scan_id)
 
     except Exception as e:
         _fail_scan(db, scan_id, e)
+        return
     finally:
         db.close()
 
+    # outside the try above: the scan is committed as done, a pool problem
+    # must not turn it into "failed" (routes render inline on a cache miss)
+    try:
+        # report is ready (from the cache) by the time the user asks for it
+        submit_prerender(scan_id)
+    except Exception as e:
+        print(f"[prerender] submit for scan {scan_id} failed: {e!r}")
+
 
-async def scans_worker_loop(poll_seconds: float = 1.0):
+class ScanWorkerPool:
     """
-    Async loop + thread offloading
+    N concurrent scan slots, split by plan class:
+      - "priority": paid scans only (plan.priority_queue=True)
+      - "standard": free scans first (FIFO), paid ones only when no free scan waits
+    Free scans can never take a priority slot, so a long paid crawl can't be
+    stuck behind free traffic, and paid scans only overflow into standard
+    slots that free users leave idle, so free users keep their own budget.
+    Each claimed scan holds one slot while _run_one runs in a thread.
     """
-    while True:
+
+    CLASSES = ("priority", "standard")
+
+    def __init__(
+        self,
+        *,
+        priority_slots: int,
+        standard_slots: int,
+        poll_seconds: float = SCAN_WORKER_POLL_SECONDS,
+    ):
+        self.slots = {"priority": priority_slots, "standard": standard_slots}
+        self.running: dict[str, set[asyncio.Task]] = {c: set() for c in self.CLASSES}
+        self.poll_seconds = poll_seconds
+        self._stopping = False
+        # set by drain() when the timeout hits: running crawls stop taking URLs
+        self._stop = threading.Event()
+        self._wake: asyncio.Event | None = None
+
+    def _free_slots(self, cls: str) -> int:
+        return self.slots[cls] - len(self.running[cls])
+
+    def _claim(self, cls: str) -> int | None:
         db = SessionLocal()
         try:
-            scan = _claim_next_scan(db)
+            return _claim_next_scan(db, priority_only=(cls == "priority"))
         finally:
             db.close()
 
-        if scan:
-            await asyncio.to_thread(_run_one, scan.id)
-        else:
-            await asyncio.sleep(poll_seconds)
\ No newline at end of file
+    def _on_slot_done(self, cls: str, task: asyncio.Task):
+        self.running[cls].discard(task)
+        if self._wake:
+            self._wake.set()
+
+    def _start(self, cls: str, scan_id: int):
+        notify_scan_changed(scan_id)  # queued -> running
+        task = asyncio.create_task(asyncio.to_thread(_run_one, scan_id, self._stop))
+        self.running[cls].add(task)
+        task.add_done_callback(lambda t, c=cls: self._on_slot_done(c, t))
+
+    async def run(self):
+        self._wake = asyncio.Event()
+        # enqueue routes / LISTEN thread set _wake -> pickup in milliseconds
+        attach_worker(asyncio.get_running_loop(), self._wake)
+        start_listener()
+
+        while not self._stopping:
+            # clear first: a slot finishing during the claim pass re-arms the wake-up
+            self._wake.clear()
+
+            for cls in self.CLASSES:
+                while not self._stopping and self._free_slots(cls) > 0:
+                    scan_id = await asyncio.to_thread(self._claim, cls)
+                    if scan_id is None:
+                        break
+                    self._start(cls, scan_id)
+
+            # sleep until a scan is queued or a slot frees up; polling is only a fallback
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self, timeout: float) -> int:
+        """
+        Stop claiming and wait up to `timeout` for running scans.
+        Scans still running then are told to stop: their crawls take no new
+        URL, and they end as failed once the fetches in flight return.
+        Returns how many scans had to be stopped that way.
+        """
+        self._stopping = True
+        detach_worker()
+        if self._wake:
+            self._wake.set()
+
+        tasks = [t for c in self.CLASSES for t in self.running[c]]
+        if not tasks:
+            return 0
+        _done, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            self._stop.set()
+            # bounded by the per-request timeouts, not by the plan's scan duration
+            await asyncio.wait(pending)
+        return len(pending)
+
+
+_pool: ScanWorkerPool | None = None
+
+
+async def scans_worker_loop(poll_seconds: float = SCAN_WORKER_POLL_SECONDS):
+    """
+    Async loop + thread offloading, with SCAN_WORKER_*_SLOTS scans in parallel.
+    Woken by queue_signal on enqueue; poll_seconds is the fallback interval.
+    """
+    global _pool
+
+    if SCAN_WORKER_PRIORITY_SLOTS + SCAN_WORKER_STANDARD_SLOTS <= 0:
+        print("[worker] no scan slots configured, worker disabled")
+        return
+
+    _pool = ScanWorkerPool(
+        priority_slots=SCAN_WORKER_PRIORITY_SLOTS,
+        standard_slots=SCAN_WORKER_STANDARD_SLOTS,
+        poll_seconds=poll_seconds,
+    )
+    await _pool.run()
+
+
+async def shutdown_scans_worker(timeout: float = SCAN_WORKER_DRAIN_SECONDS):
+    if not _pool:
+        return
+    left = await _pool.drain(timeout)
+    if left:
+        print(f"[worker] shutdown: {left} scan(s) stopped and failed after {timeout}s drain")
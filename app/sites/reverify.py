@@ -0,0 +1,156 @@
+# backend/app/sites/reverify.py
+
+"""
+Background re-verification of site ownership.
+
+Verification used to be checked once and then trusted forever. Now the
+sweeper re-runs the ownership checks on verified sites whose verified_at is
+older than SITE_REVERIFY_AFTER_HOURS:
+  success -> verified_at refreshed
+  failure -> retried on the next sweeps; once verified_at is older than
+             SITE_VERIFICATION_MAX_AGE_HOURS the site is marked unverified.
+Sites are checked in keyset batches with bounded concurrency (DNS TXT answers
+cached for their TTL). One leader per cluster runs a sweep (advisory lock).
+Advanced scans require is_verification_fresh(), which the sweeper keeps true
+for sites whose owner still proves ownership, without users hitting /verify.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, update
+
+from app.core.config import (
+    SITE_REVERIFY_INTERVAL_SECONDS,
+    SITE_REVERIFY_AFTER_HOURS,
+    SITE_VERIFICATION_MAX_AGE_HOURS,
+    SITE_REVERIFY_BATCH,
+    SITE_REVERIFY_CONCURRENCY,
+)
+from app.db.locks import AdvisoryLock
+from app.db.session import SessionLocal
+from app.sites.models import Site
+from app.sites.ownership_models import OwnershipToken
+from app.sites.verify import verify_ownership
+
+LOCK_NAME = "sites_reverify"
+
+
+def _as_utc(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def is_verification_fresh(site: Site, now: datetime | None = None) -> bool:
+    if not site.is_verified:
+        return False
+    verified_at = _as_utc(site.verified_at)
+    if verified_at is None:
+        return False
+    now = now or datetime.now(timezone.utc)
+    return now - verified_at < timedelta(hours=SITE_VERIFICATION_MAX_AGE_HOURS)
+
+
+def _due_batch(after_id: int, stale_before: datetime) -> list[tuple]:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(Site.id, Site.domain, Site.url, OwnershipToken.token)
+            .join(OwnershipToken, OwnershipToken.site_id == Site.id)
+            .filter(
+                Site.is_verified.is_(True),
+                or_(Site.verified_at.is_(None), Site.verified_at < stale_before),
+                Site.id > after_id,
+            )
+            .order_by(Site.id.asc())
+            .limit(SITE_REVERIFY_BATCH)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def _record(ok_ids: list[int], failed_ids: list[int], now: datetime) -> int:
+    """
+    One UPDATE per outcome. Returns how many sites lost verification.
+    """
+    db = SessionLocal()
+    try:
+        if ok_ids:
+            db.execute(update(Site).where(Site.id.in_(ok_ids)).values(verified_at=now))
+
+        expired = 0
+        if failed_ids:
+            expire_before = now - timedelta(hours=SITE_VERIFICATION_MAX_AGE_HOURS)
+            res = db.execute(
+                update(Site)
+                .where(
+                    Site.id.in_(failed_ids),
+                    or_(Site.verified_at.is_(None), Site.verified_at < expire_before),
+                )
+                .values(is_verified=False)
+            )
+            expired = res.rowcount or 0
+
+        db.commit()
+        return expired
+    finally:
+        db.close()
+
+
+async def reverify_sweep() -> dict:
+    lock = AdvisoryLock(LOCK_NAME)
+    if not await asyncio.to_thread(lock.acquire):
+        return {"leader": False}
+
+    stats = {"leader": True, "checked": 0, "refreshed": 0, "failed": 0, "unverified": 0}
+    sem = asyncio.Semaphore(SITE_REVERIFY_CONCURRENCY)
+
+    async def check(row) -> bool:
+        _site_id, domain, url, token = row
+        async with sem:
+            ok, _checks = await verify_ownership(domain, url, token, cached_dns=True)
+        return ok
+
+    try:
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(hours=SITE_REVERIFY_AFTER_HOURS)
+        after_id = 0
+        while True:
+            rows = await asyncio.to_thread(_due_batch, after_id, stale_before)
+            if not rows:
+                break
+            after_id = rows[-1][0]
+
+            results = await asyncio.gather(*(check(row) for row in rows))
+            ok_ids = [row[0] for row, ok in zip(rows, results) if ok]
+            failed_ids = [row[0] for row, ok in zip(rows, results) if not ok]
+            stats["unverified"] += await asyncio.to_thread(
+                _record, ok_ids, failed_ids, datetime.now(timezone.utc)
+            )
+
+            stats["checked"] += len(rows)
+            stats["refreshed"] += len(ok_ids)
+            stats["failed"] += len(failed_ids)
+    finally:
+        await asyncio.to_thread(lock.release)
+
+    return stats
+
+
+async def reverify_loop(interval_seconds: float = SITE_REVERIFY_INTERVAL_SECONDS):
+    while True:
+        try:
+            stats = await reverify_sweep()
+            if stats.get("checked"):
+                print("[reverify]", stats)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[reverify] sweep failed: {e!r}")
+        await asyncio.sleep(interval_seconds)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from urllib.parse import urlparse
 import secrets
@@ -10,7 +11,7 @@ from app.users.models import User
 
 from app.sites.models import Site
 from app.sites.ownership_models import OwnershipToken
-from app.sites.verify import verify_dns_txt, verify_well_known, verify_meta
+from app.sites.verify import verify_ownership
 from app.plans.limits import get_user_plan
 
 router = APIRouter(prefix="/sites", tags=["sites"])
@@ -117,22 +118,27 @@ def get_verification(site_id: int, db: Session = Depends(get_db), user: User = D
 
 
 @router.post("/{site_id}/verify")
-def verify_site(site_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    site = db.query(Site).filter(Site.id == site_id, Site.user_id == user.id).first()
-    if not site:
-        raise HTTPException(status_code=404, detail="Site not found")
-
-    tok = ensure_ownership_token(db, site)
-
-    dns_ok = verify_dns_txt(site.domain, tok.token)
-    wk_ok = verify_well_known(site.url, tok.token)
-    meta_ok = verify_meta(site.url, tok.token)
-
-    ok = dns_ok or wk_ok or meta_ok
-
-    if ok and not site.is_verified:
-        site.is_verified = True
-        site.verified_at = datetime.now(timezone.utc)
-        db.commit()
-
-    return {"verified": ok, "checks": {"dns_txt": dns_ok, "well_known_file": wk_ok, "meta_tag": meta_ok}}
\ No newline at end of file
+async def verify_site(site_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    def _load():
+        site = db.query(Site).filter(Site.id == site_id, Site.user_id == user.id).first()
+        if not site:
+            raise HTTPException(status_code=404, detail="Site not found")
+        tok = ensure_ownership_token(db, site)
+        # plain values: touching expired ORM attributes on the loop would block on the DB
+        return site, site.domain, site.url, tok.token
+
+    site, domain, url, token = await run_in_threadpool(_load)
+
+    # DNS + file + meta in parallel, first success cancels the rest
+    ok, checks = await verify_ownership(domain, url, token)
+
+    if ok:
+        def _mark_verified():
+            # always refresh verified_at: advanced scans need a fresh verification
+            site.is_verified = True
+            site.verified_at = datetime.now(timezone.utc)
+            db.commit()
+
+        await run_in_threadpool(_mark_verified)
+
+    return {"verified": ok, "checks": checks}
@@ -1,27 +1,70 @@
+import asyncio
 import time
-import httpx
+from collections import OrderedDict
+
+import dns.asyncresolver
 import dns.resolver
 
+from app.ssrf.http import get_async_client, async_safe_get_follow
+
+VERIFY_HEADERS = {
+    "User-Agent": "SaaS-Scanner-Verify/1.0",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+
+# TXT answers for the background sweeper: domain -> (expires_at, txt strings), LRU.
+# Only touched from the event loop. User-triggered checks bypass it, so a record
+# that was just added is seen immediately.
+TXT_CACHE_SIZE = 4096
+TXT_MIN_TTL = 30
+TXT_MAX_TTL = 3600
+TXT_NEGATIVE_TTL = 60
+_txt_cache: "OrderedDict[str, tuple[float, list[str]]]" = OrderedDict()
+
+
+async def _resolve_txt(domain: str, timeout_sec: float, use_cache: bool) -> list[str]:
+    now = time.monotonic()
+    if use_cache:
+        entry = _txt_cache.get(domain)
+        if entry and entry[0] > now:
+            _txt_cache.move_to_end(domain)
+            return entry[1]
+
+    r = dns.asyncresolver.Resolver()
+    r.timeout = timeout_sec
+    r.lifetime = timeout_sec
+    try:
+        answers = await r.resolve(domain, "TXT")
+        txts = [str(rdata) for rdata in answers]
+        ttl = min(TXT_MAX_TTL, max(TXT_MIN_TTL, answers.rrset.ttl))
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        txts, ttl = [], TXT_NEGATIVE_TTL  # timeouts etc. are not cached
+
+    _txt_cache[domain] = (now + ttl, txts)
+    _txt_cache.move_to_end(domain)
+    while len(_txt_cache) > TXT_CACHE_SIZE:
+        _txt_cache.popitem(last=False)
+    return txts
 
-def verify_dns_txt(domain: str, token: str, timeout_sec: float = 2.0) -> bool:
+
+async def verify_dns_txt(domain: str, token: str, timeout_sec: float = 2.0, use_cache: bool = False) -> bool:
     """
     DNS lookups can hang; keep strict timeouts.
+    use_cache: reuse answers for their record TTL (background re-verification).
     """
     try:
-        r = dns.resolver.Resolver()
-        r.timeout = timeout_sec
-        r.lifetime = timeout_sec
-        answers = r.resolve(domain, "TXT")
-        for rdata in answers:
-            # rdata could be like: "scanner-verification=...."
-            if token in str(rdata):
+        for txt in await _resolve_txt(domain, timeout_sec, use_cache):
+            # txt could be like: "scanner-verification=...."
+            if token in txt:
                 return True
     except Exception:
         return False
     return False
 
 
-def verify_well_known(url: str, token: str, timeout_sec: float = 5.0) -> bool:
+async def verify_well_known(url: str, token: str, timeout_sec: float = 5.0) -> bool:
     """
     Check /.well-known/security-scanner.txt and bypass CDN caches via ?ts=
     """
@@ -30,22 +73,13 @@ def verify_well_known(url: str, token: str, timeout_sec: float = 5.0) -> bool:
     verify_url = f"{base}/.well-known/security-scanner.txt?ts={ts}"
 
     try:
-        r = httpx.get(
-            verify_url,
-            timeout=timeout_sec,
-            follow_redirects=True,
-            headers={
-                "User-Agent": "SaaS-Scanner-Verify/1.0",
-                "Cache-Control": "no-cache",
-                "Pragma": "no-cache",
-            },
-        )
+        r = await async_safe_get_follow(get_async_client(), verify_url, timeout=timeout_sec, headers=VERIFY_HEADERS)
         return r.status_code == 200 and token in (r.text or "")
     except Exception:
         return False
 
 
-def verify_meta(url: str, token: str, timeout_sec: float = 5.0) -> bool:
+async def verify_meta(url: str, token: str, timeout_sec: float = 5.0) -> bool:
     """
     Look for:
       <meta name="scanner-verification" content="<token>">
@@ -55,16 +89,7 @@ def verify_meta(url: str, token: str, timeout_sec: float = 5.0) -> bool:
     meta_url = f"{url}{'&' if '?' in url else '?'}ts={ts}"
 
     try:
-        r = httpx.get(
-            meta_url,
-            timeout=timeout_sec,
-            follow_redirects=True,
-            headers={
-                "User-Agent": "SaaS-Scanner-Verify/1.0",
-                "Cache-Control": "no-cache",
-                "Pragma": "no-cache",
-            },
-        )
+        r = await async_safe_get_follow(get_async_client(), meta_url, timeout=timeout_sec, headers=VERIFY_HEADERS)
         if r.status_code != 200:
             return False
 
@@ -77,4 +102,33 @@ def verify_meta(url: str, token: str, timeout_sec: float = 5.0) -> bool:
 
         return token in html
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+async def verify_ownership(domain: str, url: str, token: str, cached_dns: bool = False) -> tuple[bool, dict]:
+    """
+    Run the three checks concurrently; the first success wins and the others
+    are cancelled. checks[name] is True/False, or None if cancelled before finishing.
+    """
+    tasks = {
+        asyncio.create_task(verify_dns_txt(domain, token, use_cache=cached_dns)): "dns_txt",
+        asyncio.create_task(verify_well_known(url, token)): "well_known_file",
+        asyncio.create_task(verify_meta(url, token)): "meta_tag",
+    }
+    checks: dict[str, bool | None] = {name: None for name in tasks.values()}
+
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                checks[tasks[t]] = bool(t.result())
+            if any(checks.values()):
+                break
+    finally:
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return any(checks.values()), checks
@@ -1,7 +1,12 @@
 import ipaddress
 import socket
+import threading
+import time
+from collections import OrderedDict
 from urllib.parse import urlparse
 
+from app.core.config import DNS_CACHE_TTL, DNS_NEGATIVE_TTL, DNS_CACHE_SIZE
+
 BLOCKED_HOSTNAMES = {"localhost"}
 
 BLOCKED_IPS = {
@@ -37,7 +42,7 @@ def is_ip_blocked(ip: str) -> bool:
     except ValueError:
         return True
 
-def resolve_all_ips(host: str) -> list[str]:
+def _getaddrinfo_ips(host: str) -> list[str]:
     infos = socket.getaddrinfo(host, None)
     ips: list[str] = []
     for _family, _type, _proto, _canon, sockaddr in infos:
@@ -46,14 +51,45 @@ def resolve_all_ips(host: str) -> list[str]:
             ips.append(ip)
     return ips
 
-def validate_url_target(url: str) -> tuple[str, str]:
-    p = urlparse(url)
-    if p.scheme not in ("http", "https"):
-        raise ValueError("Only http/https allowed")
-    host = p.hostname
-    if not host:
-        raise ValueError("Invalid host")
-    host_l = host.lower().strip(".")
+
+# hostname -> (expires_at, ips | None, error | None); LRU order
+_dns_cache: "OrderedDict[str, tuple[float, list[str] | None, Exception | None]]" = OrderedDict()
+_dns_lock = threading.Lock()
+
+
+def resolve_all_ips(host: str) -> list[str]:
+    """
+    Cached getaddrinfo: DNS_CACHE_TTL for answers, DNS_NEGATIVE_TTL for failures,
+    at most DNS_CACHE_SIZE hostnames (LRU).
+    """
+    now = time.monotonic()
+    with _dns_lock:
+        entry = _dns_cache.get(host)
+        if entry and entry[0] > now:
+            _dns_cache.move_to_end(host)
+            _exp, ips, err = entry
+            if err is not None:
+                raise type(err)(*err.args)
+            return list(ips)
+
+    try:
+        ips = _getaddrinfo_ips(host)
+        entry = (now + DNS_CACHE_TTL, ips, None)
+    except OSError as e:
+        entry = (now + DNS_NEGATIVE_TTL, None, e)
+
+    with _dns_lock:
+        _dns_cache[host] = entry
+        _dns_cache.move_to_end(host)
+        while len(_dns_cache) > DNS_CACHE_SIZE:
+            _dns_cache.popitem(last=False)
+
+    if entry[2] is not None:
+        raise entry[2]
+    return list(ips)
+
+
+def _validated_ips(host_l: str) -> list[str]:
     if host_l in BLOCKED_HOSTNAMES:
         raise ValueError("Blocked hostname")
 
@@ -63,5 +99,29 @@ def validate_url_target(url: str) -> tuple[str, str]:
     for ip in ips:
         if is_ip_blocked(ip):
             raise ValueError(f"Blocked resolved IP: {ip}")
+    return ips
+
+
+def resolve_pinned_ips(host: str) -> list[str]:
+    """
+    The IPs to actually connect to, in resolver order: try them one by one
+    until a connect succeeds (e.g. an AAAA answer on a host without IPv6).
+    Connecting to already-validated IPs (instead of letting the HTTP/TLS
+    client resolve again) closes the DNS-rebinding gap between validation
+    and connect.
+    """
+    return _validated_ips(host.lower().strip("."))
+
+
+def validate_url_target(url: str) -> tuple[str, str]:
+    p = urlparse(url)
+    if p.scheme not in ("http", "https"):
+        raise ValueError("Only http/https allowed")
+    host = p.hostname
+    if not host:
+        raise ValueError("Invalid host")
+    host_l = host.lower().strip(".")
+
+    _validated_ips(host_l)
 
-    return p.scheme, host_l
\ No newline at end of file
+    return p.scheme, host_l
@@ -1,15 +1,205 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
 import httpx
-from app.ssrf.guard import validate_url_target
+import httpcore
+from app.core.config import HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP2_ENABLED
+from app.ssrf.guard import validate_url_target, resolve_pinned_ips
 
 DEFAULT_TIMEOUT = 10.0
+DEFAULT_HEADERS = {"User-Agent": "SaaS-Scanner/1.0"}
 
-def safe_get(url: str, *, timeout: float = DEFAULT_TIMEOUT, headers: dict | None = None) -> httpx.Response:
-    # Validate scheme/host + DNS/IP checks (anti-SSRF + anti-rebinding basic)
-    validate_url_target(url)
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    _HTTP2 = HTTP2_ENABLED
+except ImportError:
+    _HTTP2 = False
+
+MAX_REDIRECTS = 5
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+# shared async client, bound to the loop that created it (the app's loop)
+_async_client: httpx.AsyncClient | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
 
-    h = {"User-Agent": "SaaS-Scanner/1.0"}
+
+def _headers(headers: dict | None) -> dict:
+    h = dict(DEFAULT_HEADERS)
     if headers:
         h.update(headers)
+    return h
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(HTTP_MAX_KEEPALIVE, max_connections),
+    )
+
+
+# a connect that fails this way moves on to the next validated IP
+_CONNECT_ERRORS = (httpcore.ConnectError, httpcore.ConnectTimeout)
+
+
+class _PinnedBackend(httpcore.SyncBackend):
+    """
+    TCP connects go to the SSRF-validated (cached) IPs, never to a fresh lookup,
+    trying each in order until one accepts.
+    TLS still uses the origin hostname for SNI + certificate checks.
+    """
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        err = None
+        for ip in resolve_pinned_ips(host):
+            try:
+                return super().connect_tcp(
+                    ip, port, timeout=timeout,
+                    local_address=local_address, socket_options=socket_options,
+                )
+            except _CONNECT_ERRORS as e:
+                err = e
+        raise err
+
+
+class _AsyncPinnedBackend(httpcore.AnyIOBackend):
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        err = None
+        for ip in await asyncio.to_thread(resolve_pinned_ips, host):
+            try:
+                return await super().connect_tcp(
+                    ip, port, timeout=timeout,
+                    local_address=local_address, socket_options=socket_options,
+                )
+            except _CONNECT_ERRORS as e:
+                err = e
+        raise err
+
+
+def _pinned_transport(max_connections: int, *, is_async: bool):
+    cls = httpx.AsyncHTTPTransport if is_async else httpx.HTTPTransport
+    transport = cls(http2=_HTTP2, limits=_limits(max_connections))
+    # httpx has no public hook for the network backend (httpcore 1.x pool attribute)
+    transport._pool._network_backend = _AsyncPinnedBackend() if is_async else _PinnedBackend()
+    return transport
+
+
+def make_client(*, timeout: float = DEFAULT_TIMEOUT, max_connections: int = HTTP_MAX_CONNECTIONS) -> httpx.Client:
+    # redirects stay off: every hop must go through safe_get validation
+    return httpx.Client(
+        timeout=timeout,
+        follow_redirects=False,
+        transport=_pinned_transport(max_connections, is_async=False),
+    )
+
+
+def get_client() -> httpx.Client:
+    """
+    Process-wide keep-alive pool (httpx.Client is thread-safe),
+    so repeated requests to one origin reuse TCP/TLS connections.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = make_client()
+    return _client
+
+
+def close_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def safe_get(
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: dict | None = None,
+    client: httpx.Client | None = None,
+) -> httpx.Response:
+    # Validate scheme/host + DNS/IP checks (anti-SSRF + anti-rebinding basic)
+    validate_url_target(url)
+
+    c = client or get_client()
+    return c.get(url, headers=_headers(headers), timeout=timeout)
+
+
+def make_async_client(*, timeout: float = DEFAULT_TIMEOUT, max_connections: int = 20) -> httpx.AsyncClient:
+    # redirects stay off: every hop must go through async_safe_get validation
+    return httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=False,
+        transport=_pinned_transport(max_connections, is_async=True),
+    )
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Process-wide async keep-alive pool for request handlers / background loops
+    running on the app's event loop (crawls keep their own per-run client).
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop or _async_client.is_closed:
+        _async_client = make_async_client(max_connections=HTTP_MAX_CONNECTIONS)
+        _async_client_loop = loop
+    return _async_client
+
+
+async def close_async_client():
+    global _async_client, _async_client_loop
+    client, _async_client, _async_client_loop = _async_client, None, None
+    if client is not None:
+        await client.aclose()
+
+
+async def async_safe_get(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: dict | None = None,
+) -> httpx.Response:
+    # same SSRF checks as safe_get; DNS lookup is blocking -> thread
+    await asyncio.to_thread(validate_url_target, url)
+    return await client.get(url, headers=_headers(headers), timeout=timeout)
+
+
+async def async_safe_get_follow(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: dict | None = None,
+    max_redirects: int = MAX_REDIRECTS,
+) -> httpx.Response:
+    """
+    async_safe_get that follows redirects by hand: every Location is
+    re-validated, so a redirect can't point the request at an internal host.
+    """
+    for _ in range(max_redirects + 1):
+        r = await async_safe_get(client, url, timeout=timeout, headers=headers)
+        if not (r.is_redirect and r.headers.get("location")):
+            return r
+        url = str(r.url.join(r.headers["location"]))
+    raise ValueError("Too many redirects")
+
 
-    with httpx.Client(timeout=timeout, follow_redirects=False) as client:
-        return client.get(url, headers=h)
\ No newline at end of file
+@asynccontextmanager
+async def async_safe_stream(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: dict | None = None,
+):
+    # like async_safe_get, but the body is read by the caller (chunked, capped)
+    await asyncio.to_thread(validate_url_target, url)
+    async with client.stream("GET", url, headers=_headers(headers), timeout=timeout) as r:
+        yield r
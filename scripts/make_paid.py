@@ -1,6 +1,7 @@
 from app.db.session import SessionLocal
 from app.users.models import User
 from app.plans.models import Plan
+from app.auth.cache import notify_user_changed
 
 EMAIL = "test@example.com"
 PAID_PLAN_NAME = "paid"  # must match Plan.name in DB
@@ -20,6 +21,9 @@ def main():
             raise SystemExit(f"Plan not found: {PAID_PLAN_NAME}")
 
         user.plan_id = paid.id
+        # Postgres: NOTIFY goes out with this commit -> API processes drop the cached plan
+        # (SQLite: they pick it up within AUTH_CACHE_TTL)
+        notify_user_changed(db, user.id)
         db.commit()
         print(f"OK: {EMAIL} -> plan={paid.name} (id={paid.id})")
     finally: